@@ -9,9 +9,23 @@ import time
 import typing
 
 import settings
-from decimal import Decimal
 from woo_x.client import Client
+from woo_x import checkpoint, logs
+from woo_x.estimators import MarketStatistics
+from woo_x.feed import MarketData
+from woo_x.freshness import FreshnessGuard, Priced
+from woo_x.ladder import Ladder
+from woo_x.ledger import Ledger
+from woo_x.markouts import MidRecorder
+from woo_x.metadata import Metadata
 from woo_x.orderbook import Orderbook
+from woo_x.orders import Order, OrderIndex, prefix_client_order_ids
+from woo_x.paper import PaperClient
+from woo_x.publication import BookPublisher
+from woo_x.risk import Limits, RiskGate
+from woo_x.runtime import GCControl, pin
+from woo_x.supervisor import Shard, Supervisor
+from woo_x.tape import Tape
 from woo_x.types import ws, rest
 
 logging.basicConfig(
@@ -21,48 +35,227 @@ logging.basicConfig(
 )
 
 
+gc_control: GCControl | None = None
+
+
 class OrderManager:
     orderbook: Orderbook | None
-    positions: dict[str, typing.Tuple[float, float]] = {}  # (holding, last_updated)
-    balances: dict[str, typing.Tuple[float, float]] = {}  # (holding, last_updated)
+    positions: dict[str, typing.Tuple[float, float]]  # (holding, last_updated)
+    balances: dict[str, typing.Tuple[float, float]]  # (holding, last_updated)
+    frozen: dict[str, float]  # Of each balance, held by open orders
+
+    def __init__(
+        self,
+        symbol: str = settings.symbol,
+        private: Client | Shard | None = None,
+        metadata: Metadata | None = None,
+        client: Client | None = None,
+        market_data: MarketData | None = None,
+        primary: bool = True,
+    ):
+        # Only the primary OrderManager of those sharing a MarketData publishes &
+        # records the symbol's book, which are per symbol rather than per account
+        self.symbol = symbol
+        self.ticks = 0
+        self.started_at = time.monotonic()
+        self.timeline: dict[str, float] = {}  # Milliseconds from start, per component
+        self.components = {
+            component: threading.Event()
+            for component in [
+                "metadata",
+                "orderbook",
+                "orders",
+                "positions",
+                "balances",
+            ]
+        }
 
-    def __init__(self):
         atexit.register(self.exit)
-        signal.signal(signal.SIGTERM, self.exit)
+        # Exits like an interrupt would, running exit() once through atexit
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
 
-        self.client = Client(
+        self.client = client or Client(
             environment=settings.environment,
             application_id=settings.application_id,
             public_api_key=settings.public_api_key,
             secret_api_key=settings.secret_api_key,
+            cpus=settings.affinity.get("feed"),
+        )
+
+        # Public streams & books, shared with other accounts' OrderManagers if any
+        self.market_data = market_data or MarketData(
+            self.client, settings.affinity.get("feed")
         )
 
-        self.exchange_information = self.client.exchange_information(settings.symbol)
+        # Source of the executionreport, position & balance streams - a Shard when
+        # a Supervisor owns the private connection on behalf of several processes
+        self.private = private or self.client
+
+        if metadata is None:
+            metadata = Metadata(
+                self.client, settings.metadata_path, settings.metadata_ttl
+            )
+
+            metadata.start()
+
+        self.metadata = metadata
         self.orderbook = None
-        self.initial_positions_snapshot = threading.Event()
-        self.initial_balances_snapshot = threading.Event()
+        self.positions = {}
+        self.balances = {}
+        self.frozen = {}
+        self.publisher = (
+            BookPublisher(self.symbol, settings.publish_depth)
+            if settings.publish_depth and primary
+            else None
+        )
+        self.statistics = MarketStatistics(settings.statistics_halflife)
+        self.markets = self.market_data.markets() if settings.market_table else None
+        self.tape = Tape(self.symbol, settings.tape_size, settings.bar_intervals)
+        self.orders = OrderIndex()
+        self.ledger = Ledger(
+            settings.ledger_path.format(
+                application_id=self.client.application_id, symbol=self.symbol
+            )
+            if settings.ledger_path
+            else None
+        )
+        self.recorder = (
+            MidRecorder(settings.record_path, self.symbol)
+            if settings.record_path and primary
+            else None
+        )
+        self.ladder = Ladder(
+            settings.count, settings.size, settings.spacing, settings.size_growth
+        )
+        self.gate = RiskGate(
+            self.metadata,
+            self.positions,
+            self.balances,
+            self.orders,
+            typing.cast(dict[str, Limits], settings.risk_limits),
+            self.frozen,
+        )
+        self.guard = FreshnessGuard(
+            self.client, lambda: self.orderbook, settings.freshness_tolerance
+        )
+        self.priced: Priced | None = None  # What the latest quotes were priced from
+        self.checkpoint_path = (
+            settings.checkpoint_path.format(
+                application_id=self.client.application_id, symbol=self.symbol
+            )
+            if settings.checkpoint_path
+            else None
+        )
+        self.adopted = False  # Whether orders left open by a previous run are live
+
+        # Warm started from the last run's checkpoint. The snapshot fetches below
+        # then reconcile it with the exchange, all at once, and orders still open
+        # are adopted on the first tick rather than cancelled
+        if self.checkpoint_path:
+            restored = checkpoint.load(
+                self.checkpoint_path, settings.checkpoint_max_age
+            )
+
+            if restored is not None:
+                self.restore(restored)
+
+        # Snapshot consumers per private subscription, rerun after a reconnection
+        # in case any updates were missed while disconnected
+        self.resyncs: dict[str, typing.Callable[[], None]] = {}
+
+        def resync(subscription: str):
+            if subscription in self.resyncs:
+                threading.Thread(target=self.resyncs[subscription], daemon=True).start()
+
+        self.private.on_reconnect(resync)
+
+        def track_metadata():
+            self.metadata.ready.wait()
+
+            self.metadata.symbol(self.symbol)
+
+            self.mark_ready("metadata")
 
         def track_orderbook():
-            for orderbook in self.client.orderbooks(settings.symbol):
+            pin(settings.affinity.get("feed"))
+
+            for orderbook in self.market_data.orderbooks(
+                self.symbol, redundancy=settings.redundancy
+            ):
                 self.orderbook = orderbook
 
+                self.mark_ready("orderbook")
+
+                self.statistics.book(orderbook)
+
+                if self.recorder:
+                    self.recorder.record(orderbook.timestamp, orderbook.signals.mid)
+
+                if self.publisher:
+                    self.publisher.publish(orderbook)
+
+        def track_trades():
+            pin(settings.affinity.get("feed"))
+
+            for trade in self.market_data.trade(self.symbol):
+                self.tape.update(trade)
+
+                self.statistics.trade(trade)
+
+        # The private stream threads, and the threads they start, share the
+        # "private" CPUs
         def track_own_orders():
-            for executionreport in self.client.executionreport():
-                match executionreport["data"]["status"]:
+            pin(settings.affinity.get("private"))
+
+            def consume_initial_snapshot():
+                self.orders.fetch(self.client, self.symbol)
+
+                self.mark_ready("orders")
+
+            self.resyncs["executionreport"] = consume_initial_snapshot
+
+            threading.Thread(target=consume_initial_snapshot, daemon=True).start()
+
+            for executionreport in self.private.executionreport():
+                if executionreport["data"]["symbol"] != self.symbol:
+                    continue
+
+                self.orders.update(executionreport)
+
+                self.ledger.update(executionreport["data"])
+
+                data = executionreport["data"]
+
+                match data["status"]:
                     case "NEW":
                         logging.info(
-                            f"Order placed (#{executionreport['data']['orderId']}): {executionreport['data']['side']} {executionreport['data']['price'], executionreport['data']['quantity']}"
+                            "Order placed (#%s): %s %s",
+                            data["orderId"],
+                            data["side"],
+                            (data["price"], data["quantity"]),
+                            extra={"category": "executionreport", "fields": data},
                         )
                     case "CANCELLED":
                         logging.info(
-                            f"Order cancelled (#{executionreport['data']['orderId']}): {executionreport['data']['side']} {executionreport['data']['price'], executionreport['data']['quantity']}"
+                            "Order cancelled (#%s): %s %s",
+                            data["orderId"],
+                            data["side"],
+                            (data["price"], data["quantity"]),
+                            extra={"category": "executionreport", "fields": data},
                         )
                     case "PARTIAL_FILLED" | "FILLED":
                         logging.info(
-                            f"Order filled (#{executionreport['data']['orderId']}): {executionreport['data']['side']} {executionreport['data']['executedQuantity']} @ {executionreport['data']['executedPrice']}"
+                            "Order filled (#%s): %s %s @ %s",
+                            data["orderId"],
+                            data["side"],
+                            data["executedQuantity"],
+                            data["executedPrice"],
+                            extra={"category": "executionreport", "fields": data},
                         )
 
         def track_position_changes():
+            pin(settings.affinity.get("private"))
+
             q = queue.Queue()
 
             class Message(typing.TypedDict):
@@ -86,7 +279,7 @@ class OrderManager:
                 q.put_nowait(message)
 
             def consume_incremental_updates():
-                for position in self.client.position():
+                for position in self.private.position():
                     message: Message = {
                         "is_snapshot": False,
                         "positions": {
@@ -97,6 +290,8 @@ class OrderManager:
 
                     q.put_nowait(message)
 
+            self.resyncs["position"] = consume_initial_snapshot
+
             threading.Thread(target=consume_initial_snapshot, daemon=True).start()
             threading.Thread(target=consume_incremental_updates, daemon=True).start()
 
@@ -111,14 +306,17 @@ class OrderManager:
                             self.positions[symbol] = position
 
                 if message["is_snapshot"]:
-                    self.initial_positions_snapshot.set()
+                    self.mark_ready("positions")
 
         def track_balance_changes():
+            pin(settings.affinity.get("private"))
+
             q = queue.Queue()
 
             class Message(typing.TypedDict):
                 is_snapshot: bool
-                balances: dict[str, typing.Tuple[float, float]]
+                # (holding, last_updated, frozen)
+                balances: dict[str, typing.Tuple[float, float, float]]
 
             def consume_initial_snapshot():
                 snapshot = self.client.get_current_holding()
@@ -126,7 +324,11 @@ class OrderManager:
                 message: Message = {
                     "is_snapshot": True,
                     "balances": {
-                        datum["token"]: (datum["holding"], snapshot["timestamp"])
+                        datum["token"]: (
+                            datum["holding"],
+                            snapshot["timestamp"],
+                            datum.get("frozen", 0.0),
+                        )
                         for datum in snapshot["data"]["holding"]
                     },
                 }
@@ -134,122 +336,466 @@ class OrderManager:
                 q.put_nowait(message)
 
             def consume_incremental_updates():
-                for balance in self.client.balance():
+                for balance in self.private.balance():
                     message: Message = {
                         "is_snapshot": False,
                         "balances": {
-                            symbol: (data["holding"], balance["ts"])
+                            symbol: (
+                                data["holding"],
+                                balance["ts"],
+                                data.get("frozen", 0.0),
+                            )
                             for symbol, data in balance["data"]["balances"].items()
                         },
                     }
 
                     q.put_nowait(message)
 
+            self.resyncs["balance"] = consume_initial_snapshot
+
             threading.Thread(target=consume_initial_snapshot, daemon=True).start()
             threading.Thread(target=consume_incremental_updates, daemon=True).start()
 
             while True:
                 message: Message = q.get()
 
-                for symbol, holding in message["balances"].items():
+                for symbol, (holding, timestamp, frozen) in message["balances"].items():
                     if symbol not in self.balances:
-                        self.balances[symbol] = holding
+                        self.balances[symbol] = (holding, timestamp)
+                        self.frozen[symbol] = frozen
                     else:
-                        if holding[1] > self.balances[symbol][1]:
-                            self.balances[symbol] = holding
+                        if timestamp > self.balances[symbol][1]:
+                            self.balances[symbol] = (holding, timestamp)
+                            self.frozen[symbol] = frozen
 
                 if message["is_snapshot"]:
-                    self.initial_balances_snapshot.set()
+                    self.mark_ready("balances")
 
+        # Every socket, snapshot & metadata fetch starts at once, see loop() for the
+        # startup timeline
+        threading.Thread(target=track_metadata, daemon=True).start()
         threading.Thread(target=track_orderbook, daemon=True).start()
+        threading.Thread(target=track_trades, daemon=True).start()
         threading.Thread(target=track_own_orders, daemon=True).start()
         threading.Thread(target=track_position_changes, daemon=True).start()
         threading.Thread(target=track_balance_changes, daemon=True).start()
 
+        if self.checkpoint_path:
+            threading.Thread(target=self.track_checkpoints, daemon=True).start()
+
+    def restore(self, restored: checkpoint.Checkpoint):
+        for order in restored["orders"]:
+            self.orders.put(order)
+
+        self.positions.update(restored["positions"])
+        self.balances.update(restored["balances"])
+
+        self.adopted = bool(restored["orders"])
+
+        logging.info(
+            f"Restored {len(restored['orders'])} orders from a checkpoint "
+            f"{time.time() * 1000 - restored['timestamp']:.0f}ms old, with the book "
+            f"at {restored['orderbook_timestamp']}"
+        )
+
+    def state(self) -> checkpoint.Checkpoint:
+        return {
+            "timestamp": int(time.time() * 1000),
+            "symbol": self.symbol,
+            "orders": self.orders.live(self.symbol),
+            "positions": dict(self.positions),
+            "balances": dict(self.balances),
+            "orderbook_timestamp": self.orderbook.timestamp if self.orderbook else None,
+        }
+
+    def track_checkpoints(self):
+        while True:
+            time.sleep(settings.checkpoint_interval)
+
+            try:
+                checkpoint.save(typing.cast(str, self.checkpoint_path), self.state())
+            except OSError as e:
+                logging.warning(f"Failed to save checkpoint: {e}")
+
+    def mark_ready(self, component: str):
+        if not self.components[component].is_set():
+            self.timeline[component] = (time.monotonic() - self.started_at) * 1000
+
+            self.components[component].set()
+
     def readiness(self):
         return {
-            "orderbook": self.orderbook is not None,
-            "positions": self.initial_positions_snapshot.is_set(),
-            "balances": self.initial_balances_snapshot.is_set(),
+            component: event.is_set() for component, event in self.components.items()
         }
 
     def ready(self):
         return all(self.readiness().values())
 
+    def metrics(self):
+        return {
+            "ready": self.ready(),
+            "ticks": self.ticks,
+            "pnl": self.pnl(),
+            "gc": gc_control.metrics() if gc_control else None,
+            "cache": self.client.cache.metrics(),
+            "freshness": self.guard.metrics(),
+            "markets": (
+                {
+                    "widest": self.markets.widest(settings.market_table),
+                    "movers": self.markets.movers(settings.market_table),
+                }
+                if self.markets
+                else None
+            ),
+            "orderbook_timestamp": self.orderbook.timestamp if self.orderbook else None,
+            "connections": {
+                name: {
+                    "connected": connection.connected,
+                    "connects": connection.connects,
+                    "rtt": connection.rtt,
+                }
+                for client in {self.client, self.market_data.client}
+                for name, connection in client.connections.items()
+            },
+            "win_rates": {
+                name: hedge.win_rates()
+                for name, hedge in self.market_data.client.hedges.items()
+            },
+        }
+
+    def pnl(self):
+        return self.ledger.snapshot(
+            self.symbol, self.orderbook.signals.mid if self.orderbook else None
+        )
+
+    def spread(self):
+        return max(
+            settings.spread,
+            settings.volatility_factor * self.statistics.volatility(settings.wait),
+            settings.spread_factor * (self.statistics.average_spread or 0),
+        )
+
     def quotes(self):
         messages: typing.List[rest.SendOrderParams] = []
 
-        def send_order_params(i) -> rest.SendOrderParams:
-            def price(i):
-                [[bid_price, _], [ask_price, _]] = self.orderbook.bbo()
+        version = self.orderbook.timestamp
 
-                pivot = bid_price if i < 0 else ask_price
+        [[bid_price, _], [ask_price, _]] = self.orderbook.bbo()
 
-                return float(
-                    Decimal(str(pivot * (1 + settings.spread) ** i)).quantize(
-                        Decimal(str(self.exchange_information["info"]["quote_tick"]))
-                    )
-                )
+        self.priced = {"version": version, "mid": (bid_price + ask_price) / 2}
 
-            def quantity(i):
-                return 0.001
-
-            return {
-                "symbol": settings.symbol,
-                "side": typing.cast(
-                    typing.Literal["BUY", "SELL"], "BUY" if i < 0 else "SELL"
-                ),
-                "order_type": "LIMIT",
-                "order_price": price(i),
-                "order_quantity": quantity(i),
-            }
+        rules = self.metadata.symbol(self.symbol)
+
+        bids, asks = self.ladder.build(
+            bid_price,
+            ask_price,
+            self.spread(),
+            rules["quote_tick"],
+            rules["base_tick"],
+        )
 
-        for i in reversed(range(1, settings.count + 1)):
-            messages.append(send_order_params(i))
-            messages.append(send_order_params(-i))
+        # Furthest levels first, alternating sides. Tagged with their level for
+        # woo_x.markouts
+        for level, (bid, bid_quantity), (ask, ask_quantity) in zip(
+            range(len(bids), 0, -1), reversed(bids), reversed(asks)
+        ):
+            messages.append(
+                {
+                    "symbol": self.symbol,
+                    "client_order_id": self.orders.next_client_order_id(),
+                    "order_tag": f"L{level}",
+                    "side": "SELL",
+                    "order_type": "LIMIT",
+                    "order_price": ask,
+                    "order_quantity": ask_quantity,
+                }
+            )
+            messages.append(
+                {
+                    "symbol": self.symbol,
+                    "client_order_id": self.orders.next_client_order_id(),
+                    "order_tag": f"L{level}",
+                    "side": "BUY",
+                    "order_type": "LIMIT",
+                    "order_price": bid,
+                    "order_quantity": bid_quantity,
+                }
+            )
 
         return messages
 
     def loop(self):
-        while not self.ready():
-            logging.info(
-                f"Some components aren't ready just yet, skipping tick: {self.readiness()}"
-            )
+        pin(settings.affinity.get("quoting"))
 
-            time.sleep(1)
+        for event in self.components.values():
+            while not event.wait(1):
+                logging.info(
+                    f"Some components aren't ready just yet, skipping tick: {self.readiness()}"
+                )
 
         try:
             while True:
-                logging.info("--------------------------------")
-                logging.info(f"Positions: {[(symbol, datum[0]) for symbol, datum in self.positions.items()]}")
-                logging.info(f"Balances: {[(symbol, datum[0]) for symbol, datum in self.balances.items()]}")
-                logging.info(f"{settings.symbol} BBO: {self.orderbook.bbo()}")
-                logging.info("--------------------------------")
+                # Formatted by the logging thread when settings.log_queue is set
+                logging.info(
+                    "--------------------------------\n"
+                    "Positions: %s\n"
+                    "Balances: %s\n"
+                    "%s BBO: %s\n"
+                    "--------------------------------",
+                    [(symbol, datum[0]) for symbol, datum in self.positions.items()],
+                    [(symbol, datum[0]) for symbol, datum in self.balances.items()],
+                    self.symbol,
+                    self.orderbook.bbo(),
+                    extra={"category": "tick"},
+                )
+
+                if self.adopted:
+                    self.adopt(self.gate.check_all(self.quotes(), replacing=True))
+                else:
+                    # Checked while the orders they replace are still known, with
+                    # the balance those free up
+                    quotes = self.gate.check_all(self.quotes(), replacing=True)
+
+                    self.client.cancel_orders(self.symbol)
+
+                    self.orders.close(self.symbol, int(time.time() * 1000))
 
-                self.client.cancel_orders(settings.symbol)
+                    with concurrent.futures.ThreadPoolExecutor() as executor:
+                        [
+                            executor.submit(
+                                self.guard.send, send_order_params, self.priced
+                            )
+                            for send_order_params in quotes
+                        ]
 
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    [
-                        executor.submit(self.client.send_order, send_order_params)
-                        for send_order_params in self.quotes()
-                    ]
+                if self.ticks == 0:
+                    self.timeline["first_quote"] = (
+                        time.monotonic() - self.started_at
+                    ) * 1000
+
+                    logging.info(
+                        f"Startup timeline (ms): {dict(sorted(self.timeline.items(), key=lambda item: item[1]))}"
+                    )
+
+                self.ticks += 1
+
+                if gc_control:
+                    gc_control.idle()
 
                 time.sleep(settings.wait)
         except (KeyboardInterrupt, SystemExit):
             sys.exit()
 
+    def adopt(self, quotes: typing.List[rest.SendOrderParams]):
+        # Keeps orders left open by the previous run that are already quoted as
+        # wanted, and only replaces the others
+        self.adopted = False
+
+        live: dict[typing.Tuple[str, float | None, float | None], Order] = {
+            (
+                order["side"],
+                order["price"],
+                round(order["quantity"] - order["executed"], 12),
+            ): order
+            for order in self.orders.live(self.symbol)
+        }
+
+        missing = []
+
+        for quote in quotes:
+            order = live.pop(
+                (quote["side"], quote.get("order_price"), quote.get("order_quantity")),
+                None,
+            )
+
+            if order is None:
+                missing.append(quote)
+
+        logging.info(
+            f"Adopted {len(quotes) - len(missing)} orders, replacing {len(live)}"
+        )
+
+        priced = typing.cast(Priced, self.priced)
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            for order in live.values():
+                executor.submit(
+                    self.client.cancel_order,
+                    {"symbol": self.symbol, "order_id": order["order_id"]},
+                )
+
+            for quote in missing:
+                executor.submit(self.guard.send, quote, priced)
+
     def exit(self):
         logging.info("Shutting down bot...")
 
-        self.client.cancel_orders(settings.symbol)
+        if settings.warm_restart and self.checkpoint_path:
+            # Left quoting for the next run to adopt
+            checkpoint.save(self.checkpoint_path, self.state())
+        else:
+            self.client.cancel_orders(self.symbol)
+
+        if self.publisher:
+            self.publisher.close()
+
+        self.ledger.close()
+
+        if self.recorder:
+            self.recorder.close()
 
         logging.info("Shut down bot.")
 
 
+def start_logging():
+    if settings.log_queue:
+        logs.start(settings.log_path, settings.log_sampling)
+
+
+def start_tuning():
+    global gc_control
+
+    gc_control = GCControl(settings.gc_mode)
+
+
+def start_freezing(order_managers: typing.List[OrderManager]):
+    # Freezes the heap once, when every OrderManager in the process has started up
+    def freeze():
+        for order_manager in order_managers:
+            for event in order_manager.components.values():
+                event.wait()
+
+        typing.cast(GCControl, gc_control).freeze()
+
+    if gc_control and settings.gc_freeze:
+        threading.Thread(target=freeze, daemon=True).start()
+
+
+def run_shard(shard: Shard):
+    start_logging()
+    start_tuning()
+
+    prefix_client_order_ids(shard.index)
+
+    metadata = Metadata(
+        Client(
+            environment=settings.environment,
+            application_id=settings.application_id,
+            public_api_key=settings.public_api_key,
+            secret_api_key=settings.secret_api_key,
+        ),
+        settings.metadata_path,
+        settings.metadata_ttl,
+    )
+
+    metadata.start()
+
+    order_managers = [
+        OrderManager(symbol, private=shard, metadata=metadata)
+        for symbol in shard.symbols
+    ]
+
+    for order_manager in order_managers:
+        threading.Thread(target=order_manager.loop, daemon=True).start()
+
+    start_freezing(order_managers)
+
+    while True:
+        shard.report(
+            {
+                order_manager.symbol: order_manager.metrics()
+                for order_manager in order_managers
+            }
+        )
+
+        time.sleep(settings.wait)
+
+
+def run_accounts():
+    # One OrderManager per account, all reading the default account's public feed
+    client = Client(
+        environment=settings.environment,
+        application_id=settings.application_id,
+        public_api_key=settings.public_api_key,
+        secret_api_key=settings.secret_api_key,
+        cpus=settings.affinity.get("feed"),
+    )
+
+    market_data = MarketData(client, settings.affinity.get("feed"))
+
+    metadata = Metadata(client, settings.metadata_path, settings.metadata_ttl)
+
+    metadata.start()
+
+    order_managers = [
+        OrderManager(
+            metadata=metadata,
+            client=Client(environment=settings.environment, **account),
+            market_data=market_data,
+            primary=i == 0,
+        )
+        for i, account in enumerate(settings.accounts)
+    ]
+
+    threads = [
+        threading.Thread(target=order_manager.loop, daemon=True)
+        for order_manager in order_managers
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    start_freezing(order_managers)
+
+    for thread in threads:
+        thread.join()
+
+
 def main():
+    start_logging()
+    start_tuning()
+
     logging.info("Initializing WOO X sample market maker.")
 
-    order_manager = OrderManager()
+    if settings.processes > 1:
+        supervisor = Supervisor(
+            client=Client(
+                environment=settings.environment,
+                application_id=settings.application_id,
+                public_api_key=settings.public_api_key,
+                secret_api_key=settings.secret_api_key,
+            ),
+            target=run_shard,
+            symbols=settings.symbols,
+            processes=settings.processes,
+            weights=settings.weights,
+            cpus=settings.affinity.get("private"),
+        )
+
+        supervisor.run()
+
+        return
+
+    if settings.accounts:
+        run_accounts()
+
+        return
+
+    if settings.paper:
+        client = PaperClient(
+            environment=settings.environment,
+            application_id=settings.application_id,
+            balances=settings.paper_balances,
+            maker_fee=settings.paper_maker_fee,
+            taker_fee=settings.paper_taker_fee,
+            cpus=settings.affinity.get("feed"),
+        )
+
+        order_manager = OrderManager(client=client, market_data=client.market_data)
+    else:
+        order_manager = OrderManager()
+
+    start_freezing([order_manager])
 
     order_manager.loop()
 
@@ -17,16 +17,137 @@ secret_api_key: str = ""
 # SPOT_BTC_USDT = BTC/USDT
 symbol: str = "PERP_BTC_USDT"
 
+# When processes is greater than 1, every symbol below is quoted instead, sharded
+# across that many worker processes. Symbols are balanced by their relative
+# weight (default 1), e.g {"PERP_BTC_USDT": 3, "PERP_ETH_USDT": 2}
+symbols: typing.List[str] = [symbol]
+
+weights: dict[str, float] = {}
+
+processes = 1
+
+# Accounts to quote symbol on from this one process, e.g subaccounts, each with
+# its own private streams & orders but all sharing a single public feed - the
+# credentials above are used for it. Ignored when processes is greater than 1.
+# [{"application_id": ..., "public_api_key": ..., "secret_api_key": ...}]
+accounts: typing.List[dict[str, str]] = []
+
 # How many orders place on each side
 # Default maximum is 2 as the API rate limit for Send Order is currently 5 per
 # symbol each second
 count = 2
 
-# In base currency
+# In base currency, of the orders nearest the best price. Each order further out
+# is size_growth times bigger
 size = 0.001
 
+size_growth = 1
+
 # Spread between best price and between each order in the grid, incremental
 spread = 0.001
 
+# Whether the spread between orders compounds ("geometric") or not ("linear")
+spacing: typing.Literal["geometric", "linear"] = "geometric"
+
+# Widen the spread above to at least these multiples of the market's realized
+# volatility over one quote (see wait) and of its average relative spread, both
+# estimated from the live book. 0 disables either
+volatility_factor = 0
+
+spread_factor = 0
+
+# Half life in milliseconds of the volatility, spread & activity rate estimates
+statistics_halflife = 60000
+
+# How many redundant connections to receive orderbook updates over, merged by
+# taking whichever delivers each update first - cuts tail latency of the feed
+redundancy = 1
+
+# Levels per side of the local orderbook to publish into shared memory for
+# other processes on this machine to read with woo_x.publication.BookReader,
+# 0 disables publication
+publish_depth = 0
+
+# How many of the latest public trades to keep, for the tape's VWAP & trade flow
+tape_size = 1000
+
+# Intervals in milliseconds to build OHLCV bars at from the trade stream
+bar_intervals = [1000, 60000]
+
+# Track every market's BBO & 24h ticker from the public feed, and report the
+# market_table widest spreads & biggest movers among them in metrics. 0 disables
+market_table = 0
+
+# Where symbol & token information is cached between runs, and how many seconds
+# it's used for before being refreshed in the background
+metadata_path = "metadata.json"
+
+metadata_ttl = 3600
+
+# Format & write logs on a background thread rather than the trading threads,
+# optionally also as JSON lines to log_path. log_sampling keeps 1 in N records
+# per category, e.g {"tick": 10, "executionreport": 1}
+log_queue = False
+
+log_path: str | None = None
+
+log_sampling: dict[str, int] = {}
+
+# Where fills are appended for the PnL & inventory ledger to pick up from on
+# restart, formatted with the account's application_id & the symbol, e.g
+# "fills-{application_id}-{symbol}.jsonl". None keeps the ledger in memory only
+ledger_path: str | None = None
+
+# Directory to record the mid price into whenever it changes, for measuring fills'
+# markouts with woo_x.markouts. None doesn't record
+record_path: str | None = None
+
+# Where open orders, positions & balances are checkpointed to every
+# checkpoint_interval seconds, formatted like ledger_path. On startup, a checkpoint
+# younger than checkpoint_max_age seconds is restored & reconciled with the
+# exchange, and its open orders adopted rather than cancelled. With warm_restart,
+# shutting down leaves orders open for the next run instead of cancelling them
+checkpoint_path: str | None = None
+
+checkpoint_interval = 5
+
+checkpoint_max_age = 300
+
+warm_restart = False
+
+# Per symbol limits checked before any order is sent, on top of the exchange's
+# own tick, size & notional rules, e.g
+# {"PERP_BTC_USDT": {"max_order_notional": 1000, "max_position": 0.01}}
+risk_limits: dict[str, dict[str, float]] = {}
+
+# Simulate orders against the live books & trades instead of sending them, starting
+# from paper_balances and charging the fee rates below. Only applies to a single
+# process & account
+paper = False
+
+paper_balances: dict[str, float] = {"USDT": 10000}
+
+paper_maker_fee = 0.0
+
+paper_taker_fee = 0.0003
+
+# Cyclic garbage collection: "default" leaves it to Python, "disabled" turns it
+# off, and "scheduled" only collects between quotes. gc_freeze exempts everything
+# allocated while starting up from collections. Pause durations are in metrics
+gc_mode: typing.Literal["default", "disabled", "scheduled"] = "default"
+
+gc_freeze = False
+
+# CPUs to pin the "feed" (orderbook & trades, including hedged connections),
+# "quoting" and "private" (executionreport, position & balance) threads to, Linux
+# only, e.g {"feed": [2], "quoting": [3], "private": [4]}
+affinity: dict[str, typing.List[int]] = {}
+
+# Orders aren't sent if the mid has moved against them, down under a bid or up
+# over an ask, by more than this (relative) since they were priced, and are
+# cancelled as soon as they're acknowledged if it has by then. 0 disables the
+# check
+freshness_tolerance = 0.0
+
 # How long to wait between quotes
 wait = 1
\ No newline at end of file
@@ -0,0 +1,43 @@
+import json
+import os
+import time
+import typing
+
+from woo_x.orders import Order
+
+
+class Checkpoint(typing.TypedDict):
+    timestamp: int  # Milliseconds
+    symbol: str
+    orders: typing.List[Order]
+    positions: dict[str, typing.Tuple[float, float]]  # (holding, last_updated)
+    balances: dict[str, typing.Tuple[float, float]]
+    orderbook_timestamp: int | None
+
+
+def save(path: str, checkpoint: Checkpoint):
+    temporary = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary, "w") as file:
+        json.dump(checkpoint, file, separators=(",", ":"))
+
+    os.replace(temporary, path)
+
+
+def load(path: str, max_age: float) -> Checkpoint | None:
+    # None if missing, unreadable, or older than max_age seconds
+    try:
+        with open(path) as file:
+            checkpoint: Checkpoint = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if time.time() * 1000 - checkpoint["timestamp"] > max_age * 1000:
+        return None
+
+    # Tuples come back from JSON as lists
+    for holdings in (checkpoint["positions"], checkpoint["balances"]):
+        for key, (holding, timestamp) in holdings.items():
+            holdings[key] = (holding, timestamp)
+
+    return checkpoint
@@ -1,19 +1,27 @@
+import collections
+import concurrent.futures
+import contextlib
 import hashlib
 import hmac
 import json
+import logging
+import queue
+import random
 import time
 import typing
-from websockets.exceptions import ConnectionClosedError
 import websockets.sync.client as websockets
-import sortedcontainers
 import requests
 import threading
-from woo_x.types import ws, rest
+from woo_x.types import ws, rest, records
 from woo_x.orderbook import Orderbook
+from woo_x.runtime import pin
+
+R = typing.TypeVar("R")  # A record type, from woo_x.types.records
 
 
 class Environment(typing.TypedDict):
     http: str
+    http_public: str  # Historical market data is served from a separate host
     ws_public: str
     ws_private: str
 
@@ -26,16 +34,134 @@ class Environments(typing.TypedDict):
 ENVIRONMENTS: Environments = {
     "production": {
         "http": "https://api.woo.org",
+        "http_public": "https://api-pub.woo.org",
         "ws_public": "wss://wss.woo.org/ws/stream/{application_id}",
         "ws_private": "wss://wss.woo.org/v2/ws/private/stream/{application_id}",
     },
     "staging": {
         "http": "https://api.staging.woo.org",
+        "http_public": "https://api-pub.staging.woo.org",
         "ws_public": "wss://wss.staging.woo.org/ws/stream/{application_id}",
         "ws_private": "wss://wss.staging.woo.org/v2/ws/private/stream/{application_id}",
     },
 }
 
+# Seconds that responses of public endpoints are reused for, by path - a trailing
+# * matches any last path segment, e.g a symbol. 0 or missing isn't cached
+CACHE_TTLS: dict[str, float] = {
+    "/v1/public/info": 60,
+    "/v1/public/info/*": 60,
+    "/v1/public/token": 60,
+    "/v1/public/token_network": 60,
+    "/v1/public/funding_rates": 5,
+    "/v1/public/funding_rate/*": 5,
+    "/v1/public/futures": 1,
+    "/v1/public/futures/*": 1,
+    "/v1/public/market_trades": 0.5,
+    "/v1/public/kline": 1,
+}
+
+
+class Cache:
+    # LRU bounded to size entries. Concurrent misses for the same key share one
+    # in-flight fetch rather than each sending their own. Cached responses are
+    # shared between callers, so mustn't be modified.
+    def __init__(self, size: int = 256):
+        self.size = size
+        self.lock = threading.Lock()
+        self.entries: collections.OrderedDict[
+            typing.Hashable, typing.Tuple[float, typing.Any]
+        ] = collections.OrderedDict()  # (expiry, value)
+        self.inflight: dict[typing.Hashable, concurrent.futures.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # Misses that waited on another's fetch
+
+    def get(self, key: typing.Hashable, ttl: float, fetch: typing.Callable):
+        leader = False
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+
+                self.hits += 1
+
+                return entry[1]
+
+            future = self.inflight.get(key)
+
+            if future is None:
+                future = self.inflight[key] = concurrent.futures.Future()
+
+                leader = True
+
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch()
+        except Exception as e:
+            with self.lock:
+                del self.inflight[key]
+
+            future.set_exception(e)
+
+            raise
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+            del self.inflight[key]
+
+        future.set_result(value)
+
+        return value
+
+    def metrics(self):
+        lookups = self.hits + self.misses + self.coalesced
+
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0,
+        }
+
+
+class Connection:
+    def __init__(self, name: str):
+        self.name = name
+        self.connects = 0
+        self.connected = False
+        self.rtt: float | None = None  # Seconds, of the latest heartbeat
+        self.last_message: float | None = None  # time.monotonic()
+        self.wins = 0  # Messages first to arrive among redundant connections
+
+
+class Hedge:
+    def __init__(self, name: str, connections: typing.List[Connection]):
+        self.name = name
+        self.connections = connections
+        self.messages = 0  # Distinct messages, i.e after deduplication
+        self.duplicates = 0
+
+    def win_rates(self) -> dict[str, float]:
+        return {
+            connection.name: connection.wins / self.messages if self.messages else 0
+            for connection in self.connections
+        }
+
 
 class Client:
     environment: typing.Literal[
@@ -54,12 +180,32 @@ class Client:
         application_id: str,
         public_api_key: str,
         secret_api_key: str,
+        heartbeat_interval: float = 10,
+        heartbeat_timeout: float = 30,
+        max_backoff: float = 30,
+        cache_size: int = 256,
+        cache_ttls: dict[str, float] | None = None,
+        cpus: typing.List[int] | None = None,
     ):
         self.environment = environment
         self.application_id = application_id
         self.public_api_key = public_api_key
         self.secret_api_key = secret_api_key
         self.session = requests.Session()
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_backoff = max_backoff
+        self.connections: dict[str, Connection] = {}
+        self.hedges: dict[str, Hedge] = {}
+        self.reconnect_listeners: typing.List[typing.Callable[[str], None]] = []
+        self.cache = Cache(cache_size)
+        self.cache_ttls = {**CACHE_TTLS, **(cache_ttls or {})}
+        self.cpus = cpus  # To pin the threads consuming hedged connections to
+
+    def on_reconnect(self, listener: typing.Callable[[str], None]):
+        # Called with the subscription's id once it's re-established, so consumers
+        # keeping state from it know to resynchronize from a snapshot
+        self.reconnect_listeners.append(listener)
 
     def signature_v1(self, timestamp: str, **kwargs):
         signable = (
@@ -98,10 +244,41 @@ class Client:
 
         return signature
 
-    def request(self, method: str, path: str, auth: bool, **kwargs):
-        request = requests.Request(
-            method, ENVIRONMENTS[self.environment]["http"] + path
-        )
+    def request(
+        self,
+        method: str,
+        path: str,
+        auth: bool,
+        *,
+        host: typing.Literal["http", "http_public"] = "http",
+        **kwargs,
+    ):
+        if not auth and method == "GET":
+            endpoint = path.split("?")[0]
+
+            ttl = self.cache_ttls.get(
+                endpoint, self.cache_ttls.get(endpoint.rsplit("/", 1)[0] + "/*", 0)
+            )
+
+            if ttl > 0:
+                return self.cache.get(
+                    (host, path, tuple(sorted(kwargs.items()))),
+                    ttl,
+                    lambda: self.send(method, path, auth, host=host, **kwargs),
+                )
+
+        return self.send(method, path, auth, host=host, **kwargs)
+
+    def send(
+        self,
+        method: str,
+        path: str,
+        auth: bool,
+        *,
+        host: typing.Literal["http", "http_public"] = "http",
+        **kwargs,
+    ):
+        request = requests.Request(method, ENVIRONMENTS[self.environment][host] + path)
 
         if method in ['POST', 'PUT']:
             request.data = kwargs
@@ -144,85 +321,183 @@ class Client:
 
         return response.json()
 
-    def public_ws(self, sub_request: dict) -> typing.Iterable[dict]:
-        with websockets.connect(
-                ENVIRONMENTS[self.environment]["ws_public"].format(
-                    application_id=self.application_id
-                )
-        ) as connection:
-            connection.send(json.dumps(sub_request))
+    def websocket(
+        self, url: str, subscription: dict, auth: bool
+    ) -> typing.Iterable[dict]:
+        connection = self.connections.setdefault(
+            subscription["id"], Connection(subscription["id"])
+        )
 
-            for raw_message in connection:
-                message = json.loads(raw_message)
+        attempt = 0
 
-                if 'event' in message:
-                    if message['event'] == 'ping':
-                        threading.Thread(
-                            target=connection.send, args=[json.dumps({"event": "pong"})]
-                        ).start()
+        while True:
+            try:
+                with websockets.connect(url) as websocket:
+                    if auth:
+                        timestamp = str(int(time.time() * 1000))
 
-                        continue
+                        auth_request: ws.AuthRequest = {
+                            "id": "auth",
+                            "event": "auth",
+                            "params": {
+                                "apikey": self.public_api_key,
+                                "sign": self.signature_v1(timestamp),
+                                "timestamp": timestamp,
+                            },
+                        }
 
-                    if message['event'] == 'subscribe':
-                        if not message["success"]:
-                            raise RuntimeError(message)
+                        websocket.send(json.dumps(auth_request))
 
-                        continue
+                    websocket.send(json.dumps(subscription))
 
-                if "data" not in message:
-                    continue
+                    pinged_at: float | None = None
 
-                yield message
+                    next_ping = time.monotonic() + self.heartbeat_interval
 
-    def private_ws(self, subscription: dict) -> typing.Iterable[dict]:
-        with websockets.connect(
-                ENVIRONMENTS[self.environment]["ws_private"].format(
-                    application_id=self.application_id
+                    while True:
+                        now = time.monotonic()
+
+                        if pinged_at and now - pinged_at > self.heartbeat_timeout:
+                            raise TimeoutError("No heartbeat received")
+
+                        if now >= next_ping:
+                            if pinged_at is None:
+                                pinged_at = now
+
+                            websocket.send(json.dumps({"event": "ping"}))
+
+                            next_ping = now + self.heartbeat_interval
+
+                        try:
+                            raw_message = websocket.recv(timeout=next_ping - now)
+                        except TimeoutError:
+                            continue
+
+                        connection.last_message = time.monotonic()
+
+                        message = json.loads(raw_message)
+
+                        if "event" in message:
+                            if message["event"] == "ping":
+                                websocket.send(json.dumps({"event": "pong"}))
+
+                                continue
+
+                            if message["event"] == "pong":
+                                if pinged_at is not None:
+                                    connection.rtt = connection.last_message - pinged_at
+
+                                    pinged_at = None
+
+                                continue
+
+                            if message["event"] in ["auth", "subscribe"]:
+                                if not message["success"]:
+                                    raise RuntimeError(message)
+
+                                if message["event"] == "subscribe":
+                                    attempt = 0
+
+                                    connection.connected = True
+                                    connection.connects += 1
+
+                                    if connection.connects > 1:
+                                        for listener in self.reconnect_listeners:
+                                            listener(subscription["id"])
+
+                                continue
+
+                        if "data" not in message:
+                            continue
+
+                        yield message
+            except Exception as e:
+                # Failed auth or subscriptions, malformed messages & failing
+                # reconnect listeners included, so the stream never ends
+                connection.connected = False
+
+                # Full jitter, so that every stream doesn't reconnect in lockstep
+                backoff = random.uniform(0, min(2**attempt, self.max_backoff))
+
+                attempt += 1
+
+                logging.warning(
+                    f"{subscription['id']} disconnected ({e!r}), reconnecting in {backoff:.2f}s"
                 )
-        ) as connection:
-            timestamp = str(int(time.time() * 1000))
 
-            auth_request: ws.AuthRequest = {
-                "id": "auth",
-                "event": "auth",
-                "params": {
-                    "apikey": self.public_api_key,
-                    "sign": self.signature_v1(timestamp),
-                    "timestamp": timestamp,
-                },
-            }
+                time.sleep(backoff)
 
-            connection.send(json.dumps(auth_request))
+    def public_ws(self, sub_request: dict) -> typing.Iterable[dict]:
+        return self.websocket(
+            ENVIRONMENTS[self.environment]["ws_public"].format(
+                application_id=self.application_id
+            ),
+            sub_request,
+            False,
+        )
 
-            connection.send(json.dumps(subscription))
+    def private_ws(self, subscription: dict) -> typing.Iterable[dict]:
+        return self.websocket(
+            ENVIRONMENTS[self.environment]["ws_private"].format(
+                application_id=self.application_id
+            ),
+            subscription,
+            True,
+        )
 
-            for raw_message in connection:
-                message = json.loads(raw_message)
+    def hedged_public_ws(
+        self, sub_request: dict, redundancy: int
+    ) -> typing.Iterable[dict]:
+        # Subscribes on several connections at once and merges them, yielding each
+        # message from whichever connection delivers it first. Only suitable for
+        # topics with strictly increasing timestamps, e.g orderbookupdate.
+        if redundancy <= 1:
+            yield from self.public_ws(sub_request)
 
-                if 'event' in message:
-                    if message['event'] == 'ping':
-                        threading.Thread(
-                            target=connection.send, args=[json.dumps({"event": "pong"})]
-                        ).start()
+            return
 
-                        continue
+        q: queue.SimpleQueue = queue.SimpleQueue()
 
-                    if message['event'] == 'auth':
-                        if not message["success"]:
-                            raise RuntimeError(message)
+        sub_requests = [
+            {**sub_request, "id": f"{sub_request['id']}#{i}"} for i in range(redundancy)
+        ]
 
-                        continue
+        def consume(sub_request: dict):
+            pin(self.cpus)
 
-                    if message['event'] == 'subscribe':
-                        if not message["success"]:
-                            raise RuntimeError(message)
+            for message in self.public_ws(sub_request):
+                q.put((sub_request["id"], message))
 
-                        continue
+        for r in sub_requests:
+            threading.Thread(target=consume, args=[r], daemon=True).start()
 
-                if "data" not in message:
-                    continue
+        hedge = self.hedges[sub_request["id"]] = Hedge(
+            sub_request["id"],
+            [
+                self.connections.setdefault(r["id"], Connection(r["id"]))
+                for r in sub_requests
+            ],
+        )
 
-                yield message
+        # Each connection delivers an unbroken sequence, so the first arrival of
+        # every newer timestamp extends the merged sequence without gaps
+        latest = 0
+
+        while True:
+            name, message = q.get()
+
+            if message["ts"] <= latest:
+                hedge.duplicates += 1
+
+                continue
+
+            latest = message["ts"]
+
+            hedge.messages += 1
+
+            self.connections[name].wins += 1
+
+            yield message
 
     def exchange_information(self, symbol: str) -> rest.ExchangeInformationResponse:
         return self.request("GET", f"/v1/public/info/{symbol}", False)
@@ -235,7 +510,25 @@ class Client:
             "GET", "/v1/public/market_trades", False, symbol=symbol, limit=limit
         )
 
-    # TODO: Market Trades History(Public)
+    def market_trades_history(
+        self,
+        symbol: str,
+        start_time: int,
+        end_time: int,
+        page: int = 1,
+        size: int = 1000,
+    ) -> rest.MarketTradesHistoryResponse:
+        return self.request(
+            "GET",
+            "/v1/hist/trades",
+            False,
+            host="http_public",
+            symbol=symbol,
+            start_time=start_time,
+            end_time=end_time,
+            page=page,
+            size=size,
+        )
 
     def orderbook_snapshot(
         self, symbol: str, max_level: int = 5
@@ -251,7 +544,27 @@ class Client:
             "GET", "/v1/public/kline", False, symbol=symbol, type=type, limit=limit
         )
 
-    # TODO: Kline - Historical Data
+    def kline_history(
+        self,
+        symbol: str,
+        type: rest.KlineType,
+        start_time: int,
+        end_time: int,
+        page: int = 1,
+        size: int = 1000,
+    ) -> rest.KlineHistoryResponse:
+        return self.request(
+            "GET",
+            "/v1/hist/kline",
+            False,
+            host="http_public",
+            symbol=symbol,
+            type=type,
+            start_time=start_time,
+            end_time=end_time,
+            page=page,
+            size=size,
+        )
 
     def available_token(self) -> rest.AvailableTokenResponse:
         return self.request("GET", "/v1/public/token", False)
@@ -301,8 +614,8 @@ class Client:
     def get_order_by_client_order_id(self, client_order_id: int):
         return self.request("GET", f"/v1/client/order/{client_order_id}", True)
 
-    def get_orders(self):
-        return self.request("GET", f"/v1/orders", True)
+    def get_orders(self, **kwargs) -> rest.GetOrdersResponse:
+        return self.request("GET", f"/v1/orders", True, **kwargs)
 
     def edit_order(self, order_id: int, price: str, quantity: str):
         return self.request(
@@ -316,7 +629,8 @@ class Client:
             "PUT",
             f"/v3/order/client/{client_order_id}",
             True,
-            **{"price": price, "quantity": quantity},
+            price=price,
+            quantity=quantity,
         )
 
     # TODO: Algo orders CRUD
@@ -327,7 +641,7 @@ class Client:
     def get_trades(self, oid: int):
         return self.request("GET", f"/v1/order/{oid}/trades", True)
 
-    def get_trade_history(self, **kwargs):
+    def get_trade_history(self, **kwargs) -> rest.TradeHistoryResponse:
         return self.request('GET', '/v1/client/trades', True, **kwargs)
 
     def get_archived_trade_history(self, **kwargs):
@@ -413,15 +727,38 @@ class Client:
         ):
             yield message
 
-    def orderbookupdate(self, symbol: str) -> typing.Iterable[ws.OrderbookUpdate]:
-        for message in self.public_ws(
+    @typing.overload
+    def orderbookupdate(
+        self,
+        symbol: str,
+        redundancy: int = 1,
+        *,
+        as_records: typing.Literal[False] = False,
+    ) -> typing.Iterable[ws.OrderbookUpdate]:
+        ...
+
+    @typing.overload
+    def orderbookupdate(
+        self, symbol: str, redundancy: int = 1, *, as_records: typing.Literal[True]
+    ) -> typing.Iterable[records.OrderbookUpdate]:
+        ...
+
+    def orderbookupdate(
+        self, symbol: str, redundancy: int = 1, *, as_records: bool = False
+    ):
+        messages = self.hedged_public_ws(
             {
                 "id": f"{symbol}@orderbookupdate",
                 "topic": f"{symbol}@orderbookupdate",
                 "event": "subscribe",
-            }
-        ):
-            yield message
+            },
+            redundancy,
+        )
+
+        if as_records:
+            yield from self.decoded(messages, records.OrderbookUpdate.decode)
+        else:
+            yield from messages
 
     def openinterest(self, symbol: str) -> typing.Iterable[ws.OpenInterest]:
         # TODO: raise an error when a non perpetual future symbol is entered
@@ -516,105 +853,213 @@ class Client:
         ):
             yield message
 
-    def executionreport(self) -> typing.Iterable[ws.ExecutionReport]:
-        for message in self.private_ws(
+    @typing.overload
+    def executionreport(
+        self, *, as_records: typing.Literal[False] = False
+    ) -> typing.Iterable[ws.ExecutionReport]:
+        ...
+
+    @typing.overload
+    def executionreport(
+        self, *, as_records: typing.Literal[True]
+    ) -> typing.Iterable[records.ExecutionReport]:
+        ...
+
+    def executionreport(self, *, as_records: bool = False):
+        messages = self.private_ws(
             {"id": "executionreport", "topic": "executionreport", "event": "subscribe"}
-        ):
-            yield message
+        )
 
-    def position(self) -> typing.Iterable[ws.Position]:
-        for message in self.private_ws(
+        if as_records:
+            yield from self.decoded(messages, records.ExecutionReport.decode)
+        else:
+            yield from messages
+
+    @typing.overload
+    def position(
+        self, *, as_records: typing.Literal[False] = False
+    ) -> typing.Iterable[ws.Position]:
+        ...
+
+    @typing.overload
+    def position(
+        self, *, as_records: typing.Literal[True]
+    ) -> typing.Iterable[records.Position]:
+        ...
+
+    def position(self, *, as_records: bool = False):
+        messages = self.private_ws(
             {"id": "position", "topic": "position", "event": "subscribe"}
-        ):
-            yield message
+        )
 
-    def balance(self) -> typing.Iterable[ws.Balance]:
-        for message in self.private_ws(
+        if as_records:
+            yield from self.decoded(messages, records.Position.decode)
+        else:
+            yield from messages
+
+    @typing.overload
+    def balance(
+        self, *, as_records: typing.Literal[False] = False
+    ) -> typing.Iterable[ws.Balance]:
+        ...
+
+    @typing.overload
+    def balance(
+        self, *, as_records: typing.Literal[True]
+    ) -> typing.Iterable[records.Balance]:
+        ...
+
+    def balance(self, *, as_records: bool = False):
+        messages = self.private_ws(
             {"id": "balance", "topic": "balance", "event": "subscribe"}
-        ):
-            yield message
+        )
 
-    def orderbooks(self, symbol) -> typing.Iterable[Orderbook]:
-        def apply(orderbook: Orderbook, orderbookupdate: ws.OrderbookUpdate):
-            if orderbook.timestamp != orderbookupdate["data"]["prevTs"]:
+        if as_records:
+            yield from self.decoded(messages, records.Balance.decode)
+        else:
+            yield from messages
+
+    def decoded(
+        self, messages: typing.Iterable[dict], decode: typing.Callable[[dict], R]
+    ) -> typing.Iterable[R]:
+        # Messages missing a field their record requires are logged & skipped,
+        # rather than ending the stream
+        for message in messages:
+            try:
+                record = decode(message)
+            except (KeyError, TypeError, AttributeError) as e:
+                logging.warning(f"Skipped undecodable {message.get('topic')}: {e!r}")
+
+                continue
+
+            yield record
+
+    def orderbooks(
+        self,
+        symbol,
+        signal_depth: int = 5,
+        redundancy: int = 1,
+        lock: typing.ContextManager = contextlib.nullcontext(),
+    ) -> typing.Iterable[Orderbook]:
+        # lock is held whilst the book is being modified
+        def apply(orderbook: Orderbook, orderbookupdate: records.OrderbookUpdate):
+            if orderbook.timestamp != orderbookupdate.data.prevTs:
                 raise ValueError(
-                    f"orderbook timestamp {orderbook.timestamp} does not match prevTs {orderbookupdate['data']['prevTs']} in orderbookupdate"
+                    f"orderbook timestamp {orderbook.timestamp} does not match prevTs {orderbookupdate.data.prevTs} in orderbookupdate"
                 )
 
-            def delta(
-                container: sortedcontainers.SortedDict,
-                orders: typing.List[typing.List[float]],
-            ):
-                for order in orders:
-                    price, size = order
+            orderbook.update(
+                orderbookupdate.data.bids,
+                orderbookupdate.data.asks,
+                orderbookupdate.ts,
+            )
 
-                    if size == 0:
-                        container.pop(price, None)
-                    else:
-                        container.update({price: size})
+        orderbook: None | Orderbook = None
 
-            delta(orderbook.bids, orderbookupdate["data"]["bids"])
-            delta(orderbook.asks, orderbookupdate["data"]["asks"])
-            orderbook.timestamp = orderbookupdate["ts"]
+        buffer: typing.List[records.OrderbookUpdate] = []
 
-        while True:
+        aux = {}  # One-time use variable for storing the orderbook snapshot
+
+        def get_orderbook_snapshot():
+            aux["orderbook_snapshot"] = self.orderbook_snapshot(symbol)
+
+        for orderbookupdate in self.orderbookupdate(
+            symbol, redundancy, as_records=True
+        ):
             try:
-                orderbook: None | Orderbook = None
+                if orderbook is not None:
+                    with lock:
+                        apply(orderbook, orderbookupdate)
 
-                handshook = False
+                    yield orderbook
 
-                buffer = []
+                    continue
+
+                if not buffer:
+                    threading.Thread(target=get_orderbook_snapshot, daemon=True).start()
+
+                buffer.append(orderbookupdate)
+
+                if "orderbook_snapshot" not in aux:
+                    continue
+
+                orderbook_snapshot = typing.cast(
+                    rest.OrderbookSnapshotResponse, aux.pop("orderbook_snapshot")
+                )
 
-                aux = {}  # One-time use variable for storing the orderbook snapshot
+                orderbook = Orderbook(
+                    bids=[
+                        (order["price"], order["quantity"])
+                        for order in orderbook_snapshot["bids"]
+                    ],
+                    asks=[
+                        (order["price"], order["quantity"])
+                        for order in orderbook_snapshot["asks"]
+                    ],
+                    timestamp=orderbook_snapshot["timestamp"],
+                    signal_depth=signal_depth,
+                )
 
-                def get_orderbook_snapshot():
-                    aux["orderbook_snapshot"] = self.orderbook_snapshot(symbol)
+                with lock:
+                    for orderbookupdate in buffer:
+                        if (
+                            orderbookupdate.data.prevTs
+                            >= orderbook_snapshot["timestamp"]
+                        ):
+                            apply(orderbook, orderbookupdate)
 
-                for orderbookupdate in self.orderbookupdate(symbol):
-                    if not handshook:
-                        threading.Thread(target=get_orderbook_snapshot).start()
+                buffer = []
 
-                        buffer.append(orderbookupdate)
+                yield orderbook
+            except ValueError as e:
+                # Updates were missed, e.g across a reconnection: rebuild the book
+                # from a fresh snapshot
+                logging.warning(f"Resynchronizing {symbol} orderbook: {e}")
 
-                        handshook = True
+                orderbook = None
 
-                        continue
+                buffer = []
 
-                    if "orderbook_snapshot" not in aux:
-                        buffer.append(orderbookupdate)
+    def conflated_orderbooks(
+        self, symbol, signal_depth: int = 5, redundancy: int = 1
+    ) -> typing.Iterable[typing.Tuple[Orderbook, int]]:
+        # For slow readers: a feed thread applies every update, while this yields
+        # a copy of the latest book whenever the consumer asks for the next one,
+        # along with how many updates it folds in since the previous copy
+        lock = threading.Lock()
+        changed = threading.Condition()
+        state: dict = {"orderbook": None, "updates": 0, "error": None}
+
+        def feed():
+            try:
+                for orderbook in self.orderbooks(
+                    symbol, signal_depth, redundancy, lock
+                ):
+                    with changed:
+                        state["orderbook"] = orderbook
+                        state["updates"] += 1
 
-                        continue
+                        changed.notify()
+            except Exception as e:
+                with changed:
+                    state["error"] = e
 
-                    if orderbook is None:
-                        buffer.append(orderbookupdate)
+                    changed.notify()
 
-                        orderbook_snapshot = typing.cast(
-                            rest.OrderbookSnapshotResponse, aux["orderbook_snapshot"]
-                        )
+        threading.Thread(target=feed, daemon=True).start()
 
-                        orderbook = Orderbook(
-                            bids=[
-                                (order["price"], order["quantity"])
-                                for order in orderbook_snapshot["bids"]
-                            ],
-                            asks=[
-                                (order["price"], order["quantity"])
-                                for order in orderbook_snapshot["asks"]
-                            ],
-                            timestamp=orderbook_snapshot["timestamp"],
-                        )
+        while True:
+            with changed:
+                changed.wait_for(lambda: state["updates"] or state["error"])
 
-                        for orderbookupdate in buffer:
-                            if (
-                                orderbookupdate["data"]["prevTs"]
-                                >= orderbook_snapshot["timestamp"]
-                            ):
-                                apply(orderbook, orderbookupdate)
+                if state["error"] is not None:
+                    raise state["error"]
 
-                        continue
+                orderbook, updates = state["orderbook"], state["updates"]
 
-                    apply(orderbook, orderbookupdate)
+                state["updates"] = 0
 
-                    yield orderbook
-            except ConnectionClosedError:
-                continue
+            with lock:
+                orderbook = orderbook.copy()
+
+            yield orderbook, updates
@@ -0,0 +1,99 @@
+import math
+
+from woo_x.orderbook import Orderbook
+from woo_x.types import ws
+
+
+class Rate:
+    # Exponentially decaying count of events per second
+    def __init__(self, tau: float):
+        self.tau = tau  # Milliseconds
+        self.value = 0.0
+        self.timestamp: int | None = None
+
+    def update(self, timestamp: int):
+        self.value = self.at(timestamp) + 1000 / self.tau
+        self.timestamp = max(timestamp, self.timestamp or timestamp)
+
+    def at(self, timestamp: int) -> float:
+        if self.timestamp is None:
+            return 0.0
+
+        return self.value * math.exp(-max(timestamp - self.timestamp, 0) / self.tau)
+
+
+class MarketStatistics:
+    def __init__(self, halflife: float = 60000):
+        # Every estimate decays with the same half life, in milliseconds
+        self.tau = halflife / math.log(2)
+        self.timestamp: int | None = None
+        self.mid: float | None = None
+        self.relative_spread: float | None = None
+        self.variance = 0.0  # Of log mid returns, per second
+        self.average_spread: float | None = None  # Relative to mid, time weighted
+        self.book_updates = Rate(self.tau)
+        self.trades = Rate(self.tau)
+
+    def book(self, orderbook: Orderbook):
+        self.book_updates.update(orderbook.timestamp)
+
+        mid = orderbook.signals.mid
+
+        if mid is None:
+            return
+
+        (bid_price, _), (ask_price, _) = orderbook.bbo()
+
+        relative_spread = (ask_price - bid_price) / mid
+
+        if (
+            self.timestamp is None
+            or self.mid is None
+            or self.relative_spread is None
+            or self.average_spread is None
+        ):
+            self.timestamp = orderbook.timestamp
+            self.mid = mid
+            self.relative_spread = self.average_spread = relative_spread
+
+            return
+
+        elapsed = orderbook.timestamp - self.timestamp
+
+        if elapsed <= 0:
+            # Updates sharing a timestamp are folded into the next return
+            return
+
+        alpha = 1 - math.exp(-elapsed / self.tau)
+
+        r = math.log(mid / self.mid)
+
+        self.variance += alpha * (r * r / (elapsed / 1000) - self.variance)
+
+        # The previous spread is the one that was quoted for the elapsed time
+        self.average_spread += alpha * (self.relative_spread - self.average_spread)
+
+        self.timestamp = orderbook.timestamp
+        self.mid = mid
+        self.relative_spread = relative_spread
+
+    def trade(self, trade: ws.Trade):
+        self.trades.update(trade["ts"])
+
+    def volatility(self, horizon: float = 1) -> float:
+        # Of log returns over horizon seconds
+        return math.sqrt(self.variance * horizon)
+
+    def now(self) -> int:
+        return max(self.book_updates.timestamp or 0, self.trades.timestamp or 0)
+
+    def book_update_rate(self) -> float:
+        return self.book_updates.at(self.now())
+
+    def trade_rate(self) -> float:
+        return self.trades.at(self.now())
+
+    def quote_to_trade(self) -> float | None:
+        trade_rate = self.trade_rate()
+
+        return self.book_update_rate() / trade_rate if trade_rate > 0 else None
@@ -0,0 +1,137 @@
+import logging
+import queue
+import threading
+import typing
+
+from woo_x.client import Client
+from woo_x.markets import MarketTable
+from woo_x.orderbook import Orderbook
+from woo_x.runtime import pin
+from woo_x.types import ws
+
+
+class Latest:
+    # Stands in for a subscriber's queue, keeping only the newest message so that
+    # a slow subscriber skips ahead rather than falling behind
+    def __init__(self):
+        self.changed = threading.Condition()
+        self.message: typing.Any = None
+        self.fresh = False
+
+    def put(self, message: typing.Any):
+        with self.changed:
+            self.message = message
+            self.fresh = True
+
+            self.changed.notify()
+
+    def get(self) -> typing.Any:
+        with self.changed:
+            self.changed.wait_for(lambda: self.fresh)
+
+            self.fresh = False
+
+            return self.message
+
+
+# Public market data shared by every account in the process: each stream is
+# consumed & each book built once, on the first subscription to it, then fanned
+# out to every subscriber. Accounts keep their own Client for private streams &
+# orders, and read the public side from here.
+class MarketData:
+    def __init__(self, client: Client, cpus: typing.List[int] | None = None):
+        self.client = client
+        self.cpus = cpus  # To pin the feed threads to
+        self.lock = threading.Lock()
+        self.subscribers: dict[
+            typing.Hashable, typing.List[queue.SimpleQueue | Latest]
+        ] = {}
+        self.locks: dict[typing.Hashable, threading.Lock] = {}  # Per shared book
+        self.table: MarketTable | None = None
+
+    def subscribe(
+        self,
+        key: typing.Hashable,
+        source: typing.Callable[[], typing.Iterable],
+        q: queue.SimpleQueue | Latest | None = None,
+    ) -> typing.Iterable:
+        if q is None:
+            q = queue.SimpleQueue()
+
+        with self.lock:
+            if key not in self.subscribers:
+                self.subscribers[key] = []
+
+                threading.Thread(
+                    target=self.dispatch, args=[key, source], daemon=True
+                ).start()
+
+            self.subscribers[key].append(q)
+
+        def messages(q: queue.SimpleQueue | Latest):
+            while True:
+                yield q.get()
+
+        return messages(q)
+
+    def dispatch(
+        self, key: typing.Hashable, source: typing.Callable[[], typing.Iterable]
+    ):
+        pin(self.cpus)
+
+        while True:
+            try:
+                for message in source():
+                    # Copied so subscribing doesn't race with fanning out
+                    for subscriber in list(self.subscribers[key]):
+                        subscriber.put(message)
+            except Exception as e:
+                logging.warning(f"Shared {key} feed failed ({e!r}), restarting")
+
+    def orderbooks(
+        self, symbol: str, signal_depth: int = 5, redundancy: int = 1
+    ) -> typing.Iterable[Orderbook]:
+        # The shared book is only ever updated under its lock, and each subscriber
+        # is handed its own copy of the latest one, taken under that lock
+        key = ("orderbooks", symbol, signal_depth, redundancy)
+
+        with self.lock:
+            lock = self.locks.setdefault(key, threading.Lock())
+
+        latest = 0
+
+        for orderbook in self.subscribe(
+            key,
+            lambda: self.client.orderbooks(symbol, signal_depth, redundancy, lock),
+            Latest(),
+        ):
+            with lock:
+                copy = orderbook.copy()
+
+            # A copy may already include the update notified next
+            if copy.timestamp > latest:
+                latest = copy.timestamp
+
+                yield copy
+
+    def trade(self, symbol: str) -> typing.Iterable[ws.Trade]:
+        return self.subscribe(("trade", symbol), lambda: self.client.trade(symbol))
+
+    def bbo(self, symbol: str) -> typing.Iterable[ws.BBO]:
+        return self.subscribe(("bbo", symbol), lambda: self.client.bbo(symbol))
+
+    def bbos(self) -> typing.Iterable[ws.BBOs]:
+        return self.subscribe(("bbos",), self.client.bbos)
+
+    def tickers(self) -> typing.Iterable[ws.Tickers]:
+        return self.subscribe(("tickers",), self.client.tickers)
+
+    def markets(self) -> MarketTable:
+        # Every market's BBO & ticker, kept up to date from the first call on
+        with self.lock:
+            if self.table is None:
+                self.table = MarketTable()
+
+                self.table.subscribe(self)
+
+            return self.table
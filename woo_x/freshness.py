@@ -0,0 +1,112 @@
+import logging
+import threading
+import typing
+
+from woo_x.orderbook import Orderbook
+from woo_x.types import rest
+
+if typing.TYPE_CHECKING:
+    from woo_x.client import Client
+
+
+class Priced(typing.TypedDict):
+    version: int  # Timestamp of the book the order was priced from
+    mid: float
+
+
+class FreshnessGuard:
+    # Sends orders only while the book hasn't moved against them since they were
+    # priced: once the book's version has changed, by more than tolerance
+    # (relative) of the mid, down under a bid or up over an ask. Checked again once
+    # the send is acknowledged, when an order that has gone stale is cancelled
+    # straight away. A tolerance of 0 sends every order unchecked.
+    def __init__(
+        self,
+        client: "Client",
+        book: typing.Callable[[], Orderbook | None],
+        tolerance: float = 0,
+    ):
+        self.client = client
+        self.book = book
+        self.tolerance = tolerance
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.skipped = 0  # Dropped before sending
+        self.cancelled = 0  # Cancelled once acknowledged
+
+    def moved(self, order: rest.SendOrderParams, priced: Priced) -> float | None:
+        # How far the mid has moved against the order, if past tolerance
+        orderbook = self.book()
+
+        if orderbook is None or orderbook.signals.mid is None:
+            return None
+
+        if orderbook.timestamp == priced["version"]:
+            return None
+
+        move = (orderbook.signals.mid - priced["mid"]) / priced["mid"]
+
+        if order["side"] == "BUY":
+            move = -move
+
+        return move if move > self.tolerance else None
+
+    def send(
+        self, order: rest.SendOrderParams, priced: Priced
+    ) -> rest.SendOrderResponse | None:
+        if not self.tolerance:
+            with self.lock:
+                self.sent += 1
+
+            return self.client.send_order(order)
+
+        move = self.moved(order, priced)
+
+        if move is not None:
+            with self.lock:
+                self.skipped += 1
+
+            self.log("Skipped", order, priced, move)
+
+            return None
+
+        response = self.client.send_order(order)
+
+        with self.lock:
+            self.sent += 1
+
+        move = self.moved(order, priced)
+
+        if move is not None:
+            with self.lock:
+                self.cancelled += 1
+
+            self.log("Cancelled", order, priced, move)
+
+            self.client.cancel_order(
+                {"symbol": order["symbol"], "order_id": response["order_id"]}
+            )
+
+        return response
+
+    def log(self, action: str, order: rest.SendOrderParams, priced: Priced, move):
+        orderbook = self.book()
+
+        logging.info(
+            "%s stale order: %s @ %s priced off book %s, now %s with the mid %.1fbps against it",
+            action,
+            order["side"],
+            order.get("order_price"),
+            priced["version"],
+            orderbook.timestamp if orderbook else None,
+            move * 1e4,
+            extra={"category": "freshness"},
+        )
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "sent": self.sent,
+                "skipped": self.skipped,
+                "cancelled": self.cancelled,
+            }
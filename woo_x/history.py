@@ -0,0 +1,359 @@
+import array
+import concurrent.futures
+import datetime
+import gzip
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+import time
+import typing
+import zlib
+
+import requests
+
+from woo_x.client import Client
+
+# Array typecode per column, or "s" for newline-separated strings
+Columns = typing.List[typing.Tuple[str, str]]
+
+# Fetches one page of rows within [start, end) milliseconds, and whether there's more
+Fetch = typing.Callable[
+    [Client, str, int, int, int, dict], typing.Tuple[typing.List[dict], bool]
+]
+
+
+class Dataset(typing.TypedDict):
+    columns: Columns
+    fetch: Fetch
+
+
+def more(meta) -> bool:
+    return meta["current_page"] * meta["records_per_page"] < meta["total"]
+
+
+def fetch_kline(client, symbol, start, end, page, params):
+    response = client.kline_history(symbol, params["type"], start, end, page)
+
+    return response["data"]["rows"], more(response["data"]["meta"])
+
+
+def fetch_market_trades(client, symbol, start, end, page, params):
+    response = client.market_trades_history(symbol, start, end, page)
+
+    return response["data"]["rows"], more(response["data"]["meta"])
+
+
+def fetch_trades(client, symbol, start, end, page, params):
+    response = client.get_trade_history(
+        symbol=symbol, start_t=start, end_t=end, page=page, size=500
+    )
+
+    return response["rows"], more(response["meta"])
+
+
+DATASETS: dict[str, Dataset] = {
+    "kline": {
+        "columns": [
+            ("start_timestamp", "q"),
+            ("end_timestamp", "q"),
+            ("open", "d"),
+            ("high", "d"),
+            ("low", "d"),
+            ("close", "d"),
+            ("volume", "d"),
+            ("amount", "d"),
+        ],
+        "fetch": fetch_kline,
+    },
+    "market_trades": {
+        "columns": [
+            ("executed_timestamp", "d"),
+            ("side", "s"),
+            ("source", "b"),
+            ("executed_price", "d"),
+            ("executed_quantity", "d"),
+        ],
+        "fetch": fetch_market_trades,
+    },
+    "trades": {
+        "columns": [
+            ("id", "q"),
+            ("order_id", "q"),
+            ("executed_timestamp", "d"),
+            ("side", "s"),
+            ("executed_price", "d"),
+            ("executed_quantity", "d"),
+            ("fee", "d"),
+            ("fee_asset", "s"),
+            ("is_maker", "b"),
+        ],
+        "fetch": fetch_trades,
+    },
+}
+
+
+class RateLimiter:
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self.lock = threading.Lock()
+        self.next = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+
+            at = max(now, self.next)
+
+            self.next = at + self.interval
+
+        if at > now:
+            time.sleep(at - now)
+
+
+class PartitionWriter:
+    # Appending adds to an existing partition's columns, as gzip reads concatenated
+    # members back as one. A _writing marker is left while a batch is written, so
+    # a batch a crash interrupted is cut from every column before appending more.
+    def __init__(self, directory: str, columns: Columns, append: bool = False):
+        self.columns = columns
+        self.marker = os.path.join(directory, "_writing")
+
+        os.makedirs(directory, exist_ok=True)
+
+        if append and os.path.exists(self.marker):
+            self.repair(directory)
+
+        with open(os.path.join(directory, "_schema.json"), "w") as file:
+            json.dump(columns, file)
+
+        self.files = {
+            name: gzip.open(
+                os.path.join(directory, f"{name}.gz"), "ab" if append else "wb"
+            )
+            for name, _ in columns
+        }
+
+    def write(self, rows: typing.List[dict]):
+        open(self.marker, "w").close()
+
+        for name, typecode in self.columns:
+            values = [row.get(name) for row in rows]
+
+            if typecode == "s":
+                data = "".join(f"{'' if v is None else v}\n" for v in values).encode()
+            elif typecode in "fd":
+                data = array.array(
+                    typecode, [math.nan if v is None else float(v) for v in values]
+                ).tobytes()
+            else:
+                data = array.array(
+                    typecode, [0 if v is None else int(float(v)) for v in values]
+                ).tobytes()
+
+            self.files[name].write(data)
+
+        for file in self.files.values():
+            file.flush()
+
+        os.remove(self.marker)
+
+    def repair(self, directory: str):
+        table = read_partition(directory)
+
+        logging.warning(f"Repairing {directory} after an interrupted write")
+
+        for name, column in table.items():
+            with gzip.open(os.path.join(directory, f"{name}.gz"), "wb") as file:
+                if isinstance(column, array.array):
+                    file.write(column.tobytes())
+                else:
+                    file.write("".join(f"{v}\n" for v in column).encode())
+
+        os.remove(self.marker)
+
+    def close(self):
+        for file in self.files.values():
+            file.close()
+
+
+def read_column(path: str) -> bytes:
+    # Member by member, up to wherever an interrupted append cut the last one short
+    with open(path, "rb") as file:
+        data = file.read()
+
+    chunks = []
+
+    while data:
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+        chunks.append(decompressor.decompress(data))
+
+        if not decompressor.eof:
+            logging.warning(f"{path} is truncated, reading what's complete")
+
+            break
+
+        data = decompressor.unused_data
+
+    return b"".join(chunks)
+
+
+def read_partition(directory: str) -> dict[str, array.array | typing.List[str]]:
+    # Columns are appended one at a time, so a crash part way through a batch can
+    # leave some longer than others: every column is cut to the shortest, keeping
+    # the rows complete in all of them
+    with open(os.path.join(directory, "_schema.json")) as file:
+        columns: Columns = json.load(file)
+
+    table: dict[str, array.array | typing.List[str]] = {}
+
+    for name, typecode in columns:
+        data = read_column(os.path.join(directory, f"{name}.gz"))
+
+        if typecode == "s":
+            table[name] = data.decode(errors="replace").split("\n")[:-1]
+        else:
+            column = array.array(typecode)
+
+            column.frombytes(data[: len(data) - len(data) % column.itemsize])
+
+            table[name] = column
+
+    rows = min((len(values) for values in table.values()), default=0)
+
+    if any(len(values) != rows for values in table.values()):
+        logging.warning(f"Uneven columns in {directory}, keeping the first {rows} rows")
+
+        for values in table.values():
+            del values[rows:]
+
+    return table
+
+
+class Downloader:
+    # Rows stream page by page into gzip-compressed column files, one directory per
+    # (symbol, UTC day) partition. A partition is written under a ".partial" name
+    # and renamed once complete, so the finished directories are the checkpoint:
+    # rerunning a download skips them and redoes any partial day from scratch.
+    def __init__(
+        self,
+        client: Client,
+        root: str,
+        workers: int = 4,
+        rate: float = 5,
+        retries: int = 5,
+    ):
+        self.client = client
+        self.root = root
+        self.workers = workers
+        self.rate_limiter = RateLimiter(rate)
+        self.retries = retries
+
+    def partition(self, dataset: str, symbol: str, day: datetime.date, params: dict):
+        return os.path.join(
+            self.root,
+            dataset,
+            *[f"{key}={value}" for key, value in sorted(params.items())],
+            f"symbol={symbol}",
+            f"date={day.isoformat()}",
+        )
+
+    def page(self, fetch: Fetch, symbol: str, start: int, end: int, page: int, params):
+        for attempt in range(self.retries):
+            self.rate_limiter.wait()
+
+            try:
+                return fetch(self.client, symbol, start, end, page, params)
+            except (requests.HTTPError, requests.ConnectionError) as e:
+                if attempt == self.retries - 1:
+                    raise
+
+                logging.warning(f"Retrying page {page} of {symbol} ({e})")
+
+                time.sleep(2**attempt)
+
+    def download_partition(
+        self, dataset: str, symbol: str, day: datetime.date, params: dict
+    ) -> str:
+        directory = self.partition(dataset, symbol, day, params)
+        partial = directory + ".partial"
+
+        shutil.rmtree(partial, ignore_errors=True)
+
+        start = int(
+            datetime.datetime.combine(
+                day, datetime.time(), tzinfo=datetime.timezone.utc
+            ).timestamp()
+            * 1000
+        )
+        end = start + 86400 * 1000
+
+        writer = PartitionWriter(partial, DATASETS[dataset]["columns"])
+
+        try:
+            page, has_more = 1, True
+
+            while has_more:
+                rows, has_more = self.page(
+                    DATASETS[dataset]["fetch"], symbol, start, end, page, params
+                )
+
+                writer.write(rows)
+
+                page += 1
+        finally:
+            writer.close()
+
+        if end > time.time() * 1000:
+            # The day isn't over yet, so left partial for the next run to redo
+            logging.info(f"Leaving {symbol} {day} partial until the day is over")
+
+            return partial
+
+        os.replace(partial, directory)
+
+        return directory
+
+    def download(
+        self,
+        dataset: typing.Literal["kline", "market_trades", "trades"],
+        symbols: typing.List[str],
+        start: datetime.date,
+        end: datetime.date,
+        **params,
+    ) -> typing.List[str]:
+        days = [start + datetime.timedelta(days=i) for i in range((end - start).days)]
+
+        pending = [
+            (symbol, day)
+            for symbol in symbols
+            for day in days
+            if not os.path.isdir(self.partition(dataset, symbol, day, params))
+        ]
+
+        logging.info(
+            f"Downloading {len(pending)} of {len(symbols) * len(days)} {dataset} partitions"
+        )
+
+        directories = []
+
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as executor:
+            futures = {
+                executor.submit(
+                    self.download_partition, dataset, symbol, day, params
+                ): (symbol, day)
+                for symbol, day in pending
+            }
+
+            for future in concurrent.futures.as_completed(futures):
+                symbol, day = futures[future]
+
+                try:
+                    directories.append(future.result())
+                except Exception as e:
+                    logging.error(f"Failed to download {symbol} {day}: {e}")
+
+        return directories
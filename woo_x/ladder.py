@@ -0,0 +1,73 @@
+import typing
+
+from woo_x import ticks
+
+
+class Ladder:
+    # Prices & sizes for every level of both sides in one pass, from a single BBO.
+    # Level 1 is the nearest to the touch, each level out is spread further away,
+    # either compounding (geometric) or not (linear), and size_growth times bigger.
+    def __init__(
+        self,
+        levels: int,
+        size: float,
+        spacing: typing.Literal["geometric", "linear"] = "geometric",
+        size_growth: float = 1,
+    ):
+        self.levels = levels
+        self.spacing = spacing
+        self.sizes = [size * size_growth**i for i in range(levels)]
+        self.spread: float | None = None
+        self.factors: typing.Tuple[typing.List[float], typing.List[float]] = ([], [])
+        self.rounded_sizes: dict[float, typing.List[float]] = {}
+
+    def offsets(
+        self, spread: float
+    ) -> typing.Tuple[typing.List[float], typing.List[float]]:
+        # Only recomputed when the spread changes
+        if spread != self.spread:
+            steps = range(1, self.levels + 1)
+
+            if self.spacing == "geometric":
+                self.factors = (
+                    [(1 + spread) ** -i for i in steps],
+                    [(1 + spread) ** i for i in steps],
+                )
+            else:
+                self.factors = (
+                    [1 - spread * i for i in steps],
+                    [1 + spread * i for i in steps],
+                )
+
+            self.spread = spread
+
+        return self.factors
+
+    def quantities(self, base_tick: float) -> typing.List[float]:
+        if base_tick not in self.rounded_sizes:
+            self.rounded_sizes[base_tick] = [
+                ticks.floor(size, base_tick) for size in self.sizes
+            ]
+
+        return self.rounded_sizes[base_tick]
+
+    def build(
+        self,
+        bid: float,
+        ask: float,
+        spread: float,
+        quote_tick: float,
+        base_tick: float,
+    ) -> typing.Tuple[
+        typing.List[typing.Tuple[float, float]], typing.List[typing.Tuple[float, float]]
+    ]:
+        # Prices are rounded to the tick away from the other side of the book
+        bid_factors, ask_factors = self.offsets(spread)
+
+        bid_prices = [ticks.floor(bid * factor, quote_tick) for factor in bid_factors]
+
+        ask_prices = [ticks.ceil(ask * factor, quote_tick) for factor in ask_factors]
+
+        quantities = self.quantities(base_tick)
+
+        return list(zip(bid_prices, quantities)), list(zip(ask_prices, quantities))
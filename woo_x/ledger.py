@@ -0,0 +1,168 @@
+import json
+import threading
+import typing
+
+from woo_x.types import ws
+
+
+class Fill(typing.TypedDict):
+    timestamp: int
+    symbol: str
+    side: typing.Literal["BUY", "SELL"]
+    price: float
+    quantity: float
+    fee: float
+    fee_asset: str
+    trade_id: int
+    order_id: int
+    maker: bool
+    tag: str  # The order's, e.g its ladder level
+
+
+class Snapshot(typing.TypedDict):
+    symbol: str
+    position: float  # Signed, in base currency
+    average_cost: float  # Of the open position
+    realized: float  # In quote currency, before fees
+    unrealized: float | None  # Marked to mark, None without one
+    fees: dict[str, float]  # Per fee asset
+    net: float | None  # Realized & unrealized, less fees paid in quote currency
+    volume: float  # Traded, in quote currency
+    fills: int
+    mark: float | None
+
+
+class Position:
+    __slots__ = ("quantity", "average_cost", "realized", "fees", "volume", "fills")
+
+    def __init__(self):
+        self.quantity = 0.0
+        self.average_cost = 0.0
+        self.realized = 0.0
+        self.fees: dict[str, float] = {}
+        self.volume = 0.0
+        self.fills = 0
+
+    def apply(self, fill: Fill):
+        quantity = fill["quantity"] if fill["side"] == "BUY" else -fill["quantity"]
+        price = fill["price"]
+
+        if self.quantity == 0 or (self.quantity > 0) == (quantity > 0):
+            self.average_cost = (
+                self.quantity * self.average_cost + quantity * price
+            ) / (self.quantity + quantity)
+        else:
+            closed = min(abs(quantity), abs(self.quantity))
+
+            sign = 1 if self.quantity > 0 else -1
+
+            self.realized += closed * (price - self.average_cost) * sign
+
+            if abs(quantity) > abs(self.quantity):  # Flipped, the rest opens anew
+                self.average_cost = price
+            elif abs(quantity) == abs(self.quantity):
+                self.average_cost = 0.0
+
+        self.quantity += quantity
+
+        self.fees[fill["fee_asset"]] = self.fees.get(fill["fee_asset"], 0) + fill["fee"]
+        self.volume += fill["quantity"] * price
+        self.fills += 1
+
+
+class Ledger:
+    # Inventory, average cost, PnL & fees per symbol, updated as each fill arrives.
+    # Fills are appended as JSON lines to the file at path if given, which is
+    # replayed on startup, so the ledger covers everything since it was created.
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.positions: dict[str, Position] = {}
+        self.trade_ids: dict[int, None] = {}  # Insertion ordered, bounded
+        self.file: typing.TextIO | None = None
+
+        if path is not None:
+            try:
+                with open(path) as file:
+                    for line in file:
+                        if line.strip():
+                            self.apply(json.loads(line))
+            except FileNotFoundError:
+                pass
+
+            self.file = open(path, "a")
+
+    def apply(self, fill: Fill) -> bool:
+        if fill["trade_id"] in self.trade_ids:
+            return False
+
+        self.trade_ids[fill["trade_id"]] = None
+
+        if len(self.trade_ids) > 10000:
+            del self.trade_ids[next(iter(self.trade_ids))]
+
+        if fill["symbol"] not in self.positions:
+            self.positions[fill["symbol"]] = Position()
+
+        self.positions[fill["symbol"]].apply(fill)
+
+        return True
+
+    def update(self, data: ws.ExecutionReportData):
+        if not data["executedQuantity"]:
+            return
+
+        fill: Fill = {
+            "timestamp": data["timestamp"],
+            "symbol": data["symbol"],
+            "side": data["side"],
+            "price": data["executedPrice"],
+            "quantity": data["executedQuantity"],
+            "fee": data["fee"],
+            "fee_asset": data["feeAsset"],
+            "trade_id": data["tradeId"],
+            "order_id": data["orderId"],
+            "maker": data["maker"],
+            "tag": data["orderTag"],
+        }
+
+        with self.lock:
+            if self.apply(fill) and self.file is not None:
+                self.file.write(json.dumps(fill) + "\n")
+                self.file.flush()
+
+    def snapshot(self, symbol: str, mark: float | None = None) -> Snapshot:
+        with self.lock:
+            position = self.positions.get(symbol) or Position()
+
+            quantity = position.quantity
+            average_cost = position.average_cost
+            realized = position.realized
+            fees = dict(position.fees)
+            volume = position.volume
+            fills = position.fills
+
+        unrealized = None if mark is None else quantity * (mark - average_cost)
+
+        quote = symbol.split("_")[-1]
+
+        return {
+            "symbol": symbol,
+            "position": quantity,
+            "average_cost": average_cost,
+            "realized": realized,
+            "unrealized": unrealized,
+            "fees": fees,
+            "net": (
+                None
+                if unrealized is None
+                else realized + unrealized - fees.get(quote, 0)
+            ),
+            "volume": volume,
+            "fills": fills,
+            "mark": mark,
+        }
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
@@ -0,0 +1,72 @@
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+
+
+class SamplingQueueHandler(logging.handlers.QueueHandler):
+    # Records are enqueued as they are: formatting is left to the listener thread.
+    # Records with a category, e.g extra={"category": "tick"}, are kept 1 in N
+    # times according to sampling.
+    def __init__(self, q: queue.SimpleQueue, sampling: dict[str, int]):
+        super().__init__(q)
+
+        self.sampling = sampling
+        self.counters = {category: itertools.count() for category in sampling}
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+
+        if category in self.sampling:
+            if next(self.counters[category]) % self.sampling[category]:
+                return False
+
+        return super().filter(record)
+
+
+class JSONLinesHandler(logging.FileHandler):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            {
+                "time": record.created,
+                "level": record.levelname,
+                "thread": record.threadName,
+                "category": getattr(record, "category", None),
+                "message": record.getMessage(),
+                "fields": getattr(record, "fields", None),
+            },
+            default=str,
+        )
+
+
+def start(
+    path: str | None = None, sampling: dict[str, int] | None = None
+) -> logging.handlers.QueueListener:
+    # Moves the root logger's handlers onto a background thread, optionally adding
+    # a JSON lines file at path
+    root = logging.getLogger()
+
+    handlers = list(root.handlers)
+
+    if path is not None:
+        handlers.append(JSONLinesHandler(path))
+
+    q: queue.SimpleQueue = queue.SimpleQueue()
+
+    listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    root.addHandler(SamplingQueueHandler(q, sampling or {}))
+
+    listener.start()
+
+    atexit.register(listener.stop)
+
+    return listener
@@ -0,0 +1,145 @@
+import array
+import heapq
+import math
+import threading
+import typing
+
+from woo_x.types import ws
+
+if typing.TYPE_CHECKING:
+    from woo_x.client import Client
+    from woo_x.feed import MarketData
+
+BBO_COLUMNS = ["bid", "bid_size", "ask", "ask_size"]
+
+TICKER_COLUMNS = ["open", "close", "high", "low", "volume", "amount", "count"]
+
+
+class MarketTable:
+    # One row per symbol, one array per field, updated in place from bbos & tickers
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.symbols: typing.List[str] = []
+        self.rows: dict[str, int] = {}
+        self.columns: dict[str, array.array] = {
+            name: array.array("d") for name in BBO_COLUMNS + TICKER_COLUMNS
+        }
+        self.bbo_timestamp = array.array("q")
+        self.ticker_timestamp = array.array("q")
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __getitem__(self, column: str) -> array.array:
+        return self.columns[column]
+
+    def row(self, symbol: str) -> int:
+        row = self.rows.get(symbol)
+
+        if row is not None:
+            return row
+
+        with self.lock:
+            if symbol in self.rows:
+                return self.rows[symbol]
+
+            for column in self.columns.values():
+                column.append(math.nan)
+
+            self.bbo_timestamp.append(0)
+            self.ticker_timestamp.append(0)
+            self.symbols.append(symbol)
+
+            self.rows[symbol] = len(self.symbols) - 1
+
+            return self.rows[symbol]
+
+    def update_bbos(self, bbos: ws.BBOs):
+        bid, bid_size = self.columns["bid"], self.columns["bid_size"]
+        ask, ask_size = self.columns["ask"], self.columns["ask_size"]
+
+        for datum in bbos["data"]:
+            i = self.row(datum["symbol"])
+
+            bid[i] = datum["bid"]
+            bid_size[i] = datum["bidSize"]
+            ask[i] = datum["ask"]
+            ask_size[i] = datum["askSize"]
+
+            self.bbo_timestamp[i] = bbos["ts"]
+
+    def update_tickers(self, tickers: ws.Tickers):
+        open_, close = self.columns["open"], self.columns["close"]
+        high, low = self.columns["high"], self.columns["low"]
+        volume, amount = self.columns["volume"], self.columns["amount"]
+        count = self.columns["count"]
+
+        for datum in tickers["data"]:
+            i = self.row(datum["symbol"])
+
+            open_[i] = datum["open"]
+            close[i] = datum["close"]
+            high[i] = datum["high"]
+            low[i] = datum["low"]
+            volume[i] = datum["volume"]
+            amount[i] = datum["amount"]
+            count[i] = datum["count"]
+
+            self.ticker_timestamp[i] = tickers["ts"]
+
+    def subscribe(self, client: "Client | MarketData"):
+        def track_bbos():
+            for bbos in client.bbos():
+                self.update_bbos(bbos)
+
+        def track_tickers():
+            for tickers in client.tickers():
+                self.update_tickers(tickers)
+
+        threading.Thread(target=track_bbos, daemon=True).start()
+        threading.Thread(target=track_tickers, daemon=True).start()
+
+    def spreads(self) -> array.array:
+        # Relative to mid, NaN for symbols without a BBO yet or with a mid of 0
+        return array.array(
+            "d",
+            [
+                2 * (a - b) / (a + b) if a + b else math.nan
+                for b, a in zip(self.columns["bid"], self.columns["ask"])
+            ],
+        )
+
+    def changes(self) -> array.array:
+        # Over the ticker's 24h window
+        return array.array(
+            "d",
+            [
+                c / o - 1 if o else math.nan
+                for o, c in zip(self.columns["open"], self.columns["close"])
+            ],
+        )
+
+    def top(
+        self, values: array.array, n: int, reverse: bool = True
+    ) -> typing.List[typing.Tuple[str, float]]:
+        # The n largest (or smallest) values with their symbols, NaNs excluded
+        select = heapq.nlargest if reverse else heapq.nsmallest
+
+        rows = select(
+            n,
+            (i for i, value in enumerate(values) if value == value),
+            key=values.__getitem__,
+        )
+
+        return [(self.symbols[i], values[i]) for i in rows]
+
+    def widest(self, n: int = 10) -> typing.List[typing.Tuple[str, float]]:
+        return self.top(self.spreads(), n)
+
+    def movers(self, n: int = 10) -> typing.List[typing.Tuple[str, float]]:
+        changes = self.changes()
+
+        return [
+            (symbol, changes[self.rows[symbol]])
+            for symbol, _ in self.top(array.array("d", map(abs, changes)), n)
+        ]
@@ -0,0 +1,223 @@
+import array
+import bisect
+import datetime
+import glob
+import itertools
+import json
+import os
+import queue
+import threading
+import typing
+
+from woo_x.history import Columns, PartitionWriter, read_partition
+
+HORIZONS = [100, 1000, 10000, 60000]  # Milliseconds
+
+MIDS: Columns = [("timestamp", "q"), ("mid", "d")]
+
+
+def day(timestamp: int) -> str:
+    return (
+        datetime.datetime.fromtimestamp(timestamp / 1000, datetime.timezone.utc)
+        .date()
+        .isoformat()
+    )
+
+
+class MidRecorder:
+    # Records a symbol's mid price whenever it changes, into the same daily column
+    # partitions as woo_x.history, under root/mids. Written in batches on a
+    # background thread.
+    def __init__(self, root: str, symbol: str, batch: int = 1000):
+        self.root = root
+        self.symbol = symbol
+        self.batch = batch
+        self.buffer: typing.List[typing.Tuple[int, float]] = []
+        self.last: float | None = None
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.write, daemon=True)
+
+        self.thread.start()
+
+    def record(self, timestamp: int, mid: float | None):
+        if mid is None or mid == self.last:
+            return
+
+        self.last = mid
+
+        self.buffer.append((timestamp, mid))
+
+        if len(self.buffer) >= self.batch:
+            self.queue.put(self.buffer)
+
+            self.buffer = []
+
+    def write(self):
+        while (rows := self.queue.get()) is not None:
+            for date, group in itertools.groupby(rows, key=lambda row: day(row[0])):
+                writer = PartitionWriter(
+                    os.path.join(
+                        self.root, "mids", f"symbol={self.symbol}", f"date={date}"
+                    ),
+                    MIDS,
+                    append=True,
+                )
+
+                writer.write([{"timestamp": t, "mid": mid} for t, mid in group])
+
+                writer.close()
+
+    def close(self):
+        self.queue.put(self.buffer)
+        self.queue.put(None)
+
+        self.buffer = []
+
+        self.thread.join()
+
+
+def read_mids(root: str, symbol: str) -> typing.Tuple[array.array, array.array]:
+    timestamps, mids = array.array("q"), array.array("d")
+
+    for directory in sorted(
+        glob.glob(os.path.join(root, "mids", f"symbol={symbol}", "date=*"))
+    ):
+        table = read_partition(directory)
+
+        timestamps.extend(typing.cast(array.array, table["timestamp"]))
+        mids.extend(typing.cast(array.array, table["mid"]))
+
+    return timestamps, mids
+
+
+class Fills(typing.TypedDict):
+    timestamp: array.array  # Milliseconds, ascending
+    side: typing.List[str]
+    price: array.array
+    quantity: array.array
+    level: typing.List[str]  # The order's tag, e.g "L1", if any
+
+
+def sort_fills(rows: typing.List[typing.Tuple[int, str, float, float, str]]) -> Fills:
+    rows.sort(key=lambda row: row[0])
+
+    return {
+        "timestamp": array.array("q", [row[0] for row in rows]),
+        "side": [row[1] for row in rows],
+        "price": array.array("d", [row[2] for row in rows]),
+        "quantity": array.array("d", [row[3] for row in rows]),
+        "level": [row[4] for row in rows],
+    }
+
+
+def fills_from_ledger(path: str) -> dict[str, Fills]:
+    # From the JSON lines a woo_x.ledger.Ledger appends, per symbol
+    rows: dict[str, typing.List[typing.Tuple[int, str, float, float, str]]] = {}
+
+    with open(path) as file:
+        for line in file:
+            if not line.strip():
+                continue
+
+            fill = json.loads(line)
+
+            rows.setdefault(fill["symbol"], []).append(
+                (
+                    fill["timestamp"],
+                    fill["side"],
+                    fill["price"],
+                    fill["quantity"],
+                    fill.get("tag", ""),
+                )
+            )
+
+    return {symbol: sort_fills(symbol_rows) for symbol, symbol_rows in rows.items()}
+
+
+def fills_from_history(root: str, symbol: str) -> Fills:
+    # From a woo_x.history.Downloader "trades" download under root, without levels
+    rows: typing.List[typing.Tuple[int, str, float, float, str]] = []
+
+    for directory in glob.glob(
+        os.path.join(root, "trades", f"symbol={symbol}", "date=*")
+    ):
+        table = read_partition(directory)
+
+        rows.extend(
+            (int(timestamp * 1000), side, price, quantity, "")
+            for timestamp, side, price, quantity in zip(
+                table["executed_timestamp"],
+                table["side"],
+                table["executed_price"],
+                table["executed_quantity"],
+            )
+        )
+
+    return sort_fills(rows)
+
+
+class Markout(typing.TypedDict):
+    fills: int
+    mean: float  # Basis points, positive when the mid moved in the fill's favour
+    weighted: float  # Weighted by notional
+
+
+def markouts(
+    fills: Fills,
+    timestamps: array.array,
+    mids: array.array,
+    horizons: typing.List[int] = HORIZONS,
+) -> dict[typing.Tuple[str, str, int], Markout]:
+    # Per (side, level, horizon). Fills are matched to the last mid at or before
+    # their timestamp plus the horizon by a merge of the two sorted sequences, each
+    # search starting from where the previous fill's ended. Fills whose horizon
+    # runs past the end of the recording are left out.
+    totals: dict[typing.Tuple[str, str, int], typing.List[float]] = {}
+
+    if not timestamps:
+        return {}
+
+    end = timestamps[-1]
+
+    for horizon in horizons:
+        lo = 0
+
+        for t, side, price, quantity, level in zip(
+            fills["timestamp"],
+            fills["side"],
+            fills["price"],
+            fills["quantity"],
+            fills["level"],
+        ):
+            target = t + horizon
+
+            if target > end:
+                break
+
+            lo = bisect.bisect_right(timestamps, target, lo)
+
+            if lo == 0:
+                continue
+
+            markout = (mids[lo - 1] - price) / price * 1e4
+
+            if side == "SELL":
+                markout = -markout
+
+            notional = price * quantity
+
+            total = totals.setdefault((side, level, horizon), [0, 0.0, 0.0, 0.0])
+
+            total[0] += 1
+            total[1] += markout
+            total[2] += markout * notional
+            total[3] += notional
+
+    return {
+        key: {
+            "fills": int(count),
+            "mean": total / count,
+            "weighted": weighted / notional if notional else 0.0,
+        }
+        for key, (count, total, weighted, notional) in sorted(totals.items())
+    }
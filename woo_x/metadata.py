@@ -0,0 +1,100 @@
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+
+from woo_x.client import Client
+from woo_x.types import rest
+
+
+class Metadata:
+    # Symbol & token information, warm started from the file at path and refreshed
+    # in the background once older than ttl seconds
+    def __init__(self, client: Client, path: str, ttl: float = 3600):
+        self.client = client
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.symbols: dict[str, rest.AvailableSymbolsResponseRow] = {}
+        self.tokens: dict[str, rest.AvailableTokenResponseRow] = {}
+        self.timestamp = 0.0
+        self.ready = threading.Event()  # Set once loaded or refreshed
+
+        if self.load():
+            self.ready.set()
+
+    def load(self) -> bool:
+        try:
+            with open(self.path) as file:
+                cache = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        if cache.get("environment") != self.client.environment:
+            return False
+
+        self.symbols = cache["symbols"]
+        self.tokens = cache["tokens"]
+        self.timestamp = cache["timestamp"]
+
+        return True
+
+    def save(self):
+        temporary = f"{self.path}.{os.getpid()}.tmp"  # Shards may save concurrently
+
+        with open(temporary, "w") as file:
+            json.dump(
+                {
+                    "environment": self.client.environment,
+                    "timestamp": self.timestamp,
+                    "symbols": self.symbols,
+                    "tokens": self.tokens,
+                },
+                file,
+            )
+
+        os.replace(temporary, self.path)
+
+    def refresh(self):
+        with self.lock:
+            with concurrent.futures.ThreadPoolExecutor(2) as executor:
+                symbols = executor.submit(self.client.available_symbols)
+                tokens = executor.submit(self.client.available_token)
+
+                self.symbols = {row["symbol"]: row for row in symbols.result()["rows"]}
+                self.tokens = {row["token"]: row for row in tokens.result()["rows"]}
+
+            self.timestamp = time.time()
+
+            self.save()
+
+            self.ready.set()
+
+    def start(self):
+        def refresh_periodically():
+            while True:
+                time.sleep(max(self.timestamp + self.ttl - time.time(), 0))
+
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logging.warning(f"Failed to refresh metadata: {e}")
+
+                    time.sleep(min(self.ttl, 60))
+
+        threading.Thread(target=refresh_periodically, daemon=True).start()
+
+    def symbol(self, symbol: str) -> rest.AvailableSymbolsResponseRow:
+        if symbol not in self.symbols:
+            # Not cached yet, e.g a new listing or a cold start
+            self.refresh()
+
+        return self.symbols[symbol]
+
+    def token(self, token: str) -> rest.AvailableTokenResponseRow:
+        if token not in self.tokens:
+            self.refresh()
+
+        return self.tokens[token]
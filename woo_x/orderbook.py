@@ -1,18 +1,68 @@
+import itertools
 import typing
 import sortedcontainers
 import operator
 
 
+class Signals:
+    def __init__(self, depth: int):
+        self.depth = depth
+        self.mid: float | None = None
+        self.microprice: float | None = None
+        self.imbalance: float | None = None  # Of the top depth levels, in [-1, 1]
+        self.weighted_mid: float | None = None
+
+    def top(self, orderbook: "Orderbook"):
+        if not orderbook.bids or not orderbook.asks:
+            self.mid = self.microprice = None
+
+            return
+
+        (bid_price, bid_size), (ask_price, ask_size) = orderbook.bbo()
+
+        self.mid = (bid_price + ask_price) / 2
+
+        self.microprice = (bid_price * ask_size + ask_price * bid_size) / (
+            bid_size + ask_size
+        )
+
+    def levels(self, orderbook: "Orderbook"):
+        if not orderbook.bids or not orderbook.asks:
+            self.imbalance = self.weighted_mid = None
+
+            return
+
+        bid_notional = bid_size = ask_notional = ask_size = 0.0
+
+        for price, size in itertools.islice(orderbook.bids.items(), self.depth):
+            bid_notional += price * size
+            bid_size += size
+
+        for price, size in itertools.islice(orderbook.asks.items(), self.depth):
+            ask_notional += price * size
+            ask_size += size
+
+        self.imbalance = (bid_size - ask_size) / (bid_size + ask_size)
+
+        # Microprice generalised to the top depth levels: each side's average price,
+        # weighted by the size resting on the opposite side
+        self.weighted_mid = (
+            bid_notional / bid_size * ask_size + ask_notional / ask_size * bid_size
+        ) / (bid_size + ask_size)
+
+
 class Orderbook:
     def __init__(
         self,
         bids: typing.List[typing.Tuple[float, float]],
         asks: typing.List[typing.Tuple[float, float]],
         timestamp: int,
+        signal_depth: int = 5,
     ):
         self.bids = sortedcontainers.SortedDict(operator.neg)
         self.asks = sortedcontainers.SortedDict()
         self.timestamp = timestamp
+        self.signals = Signals(signal_depth)
 
         if bids:
             self.bids.update({price: size for price, size in bids})
@@ -20,6 +70,59 @@ class Orderbook:
         if asks:
             self.asks.update({price: size for price, size in asks})
 
+        self.signals.top(self)
+        self.signals.levels(self)
+
+    def copy(self) -> "Orderbook":
+        return Orderbook(
+            list(self.bids.items()),
+            list(self.asks.items()),
+            self.timestamp,
+            self.signals.depth,
+        )
+
+    def update(
+        self,
+        bids: typing.List[typing.List[float]],
+        asks: typing.List[typing.List[float]],
+        timestamp: int,
+    ):
+        touched_top = touched_levels = False
+
+        for container, orders, sign in ((self.bids, bids, 1), (self.asks, asks, -1)):
+            if not orders:
+                continue
+
+            # Deltas at or better than the best and the depth-th best price decide
+            # which signals need recomputing - everything deeper can't move them
+            levels = len(container)
+            best = sign * container.peekitem(0)[0] if levels else None
+            nth = (
+                sign * container.peekitem(self.signals.depth - 1)[0]
+                if levels >= self.signals.depth
+                else None
+            )
+
+            for price, size in orders:
+                if nth is None or sign * price >= nth:
+                    touched_levels = True
+
+                    if best is None or sign * price >= best:
+                        touched_top = True
+
+                if size == 0:
+                    container.pop(price, None)
+                else:
+                    container[price] = size
+
+        self.timestamp = timestamp
+
+        if touched_top:
+            self.signals.top(self)
+
+        if touched_levels:
+            self.signals.levels(self)
+
     def bbo(
         self,
     ) -> typing.Tuple[typing.Tuple[float, float], typing.Tuple[float, float]]:
@@ -0,0 +1,248 @@
+import itertools
+import threading
+import time
+import typing
+
+from woo_x.types import ws, rest
+
+if typing.TYPE_CHECKING:
+    from woo_x.client import Client
+
+
+class Order(typing.TypedDict):
+    order_id: int
+    client_order_id: int | None
+    symbol: str
+    side: typing.Literal["BUY", "SELL"]
+    price: float
+    quantity: float
+    executed: float
+    status: str
+    timestamp: int  # Milliseconds, of the last update applied
+
+
+Level = typing.Tuple[str, str, float]  # (symbol, side, price)
+
+CLOSED = {"CANCELLED", "FILLED", "REJECTED", "COMPLETED"}
+
+# Client order IDs must be unique per account, so every OrderIndex in the process
+# draws from one counter. Seeded from the clock in microseconds so that IDs keep
+# increasing across restarts, under a prefix in the bits above it that tells apart
+# processes quoting on the same account, i.e shards
+client_order_ids = itertools.count(int(time.time() * 1e6))
+
+
+def prefix_client_order_ids(prefix: int):
+    global client_order_ids
+
+    client_order_ids = itertools.count((prefix << 52) + int(time.time() * 1e6))
+
+
+class OrderIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.orders: dict[int, Order] = {}
+        self.client_order_ids: dict[int, int] = {}
+        self.levels: dict[Level, dict[int, Order]] = {}
+        self.closed: dict[int, int] = {}  # order_id -> timestamp, pruned on reconcile
+        self.resting: dict[typing.Tuple[str, str], float] = {}  # Unfilled quantity
+        self.notional: dict[typing.Tuple[str, str], float] = {}  # ... times price
+
+    def next_client_order_id(self) -> int:
+        return next(client_order_ids)
+
+    def get(self, order_id: int) -> Order | None:
+        return self.orders.get(order_id)
+
+    def get_by_client_order_id(self, client_order_id: int) -> Order | None:
+        order_id = self.client_order_ids.get(client_order_id)
+
+        return None if order_id is None else self.orders.get(order_id)
+
+    def at(
+        self, symbol: str, side: typing.Literal["BUY", "SELL"], price: float
+    ) -> typing.List[Order]:
+        # In the order they were placed, i.e queue priority
+        with self.lock:
+            return list(self.levels.get((symbol, side, price), {}).values())
+
+    def live(self, symbol: str | None = None) -> typing.List[Order]:
+        with self.lock:
+            return [
+                order
+                for order in self.orders.values()
+                if symbol is None or order["symbol"] == symbol
+            ]
+
+    def put(self, order: Order):
+        with self.lock:
+            self.remove(order["order_id"])
+
+            self.orders[order["order_id"]] = order
+
+            if order["client_order_id"] is not None:
+                self.client_order_ids[order["client_order_id"]] = order["order_id"]
+
+            self.levels.setdefault(
+                (order["symbol"], order["side"], order["price"]), {}
+            )[order["order_id"]] = order
+
+            side = (order["symbol"], order["side"])
+
+            remaining = (order["quantity"] or 0) - order["executed"]
+
+            self.resting[side] = self.resting.get(side, 0.0) + remaining
+            self.notional[side] = (
+                self.notional.get(side, 0.0) + (order["price"] or 0) * remaining
+            )
+
+    def remove(self, order_id: int) -> Order | None:
+        with self.lock:
+            order = self.orders.pop(order_id, None)
+
+            if order is None:
+                return None
+
+            if order["client_order_id"] is not None:
+                self.client_order_ids.pop(order["client_order_id"], None)
+
+            level = (order["symbol"], order["side"], order["price"])
+
+            orders = self.levels[level]
+
+            del orders[order_id]
+
+            if not orders:
+                del self.levels[level]
+
+            side = (order["symbol"], order["side"])
+
+            remaining = (order["quantity"] or 0) - order["executed"]
+
+            self.resting[side] -= remaining
+            self.notional[side] -= (order["price"] or 0) * remaining
+
+            return order
+
+    def close(self, symbol: str, timestamp: int):
+        # For when every order of symbol is known to be gone, e.g after a successful
+        # cancel_orders, ahead of their execution reports
+        with self.lock:
+            for order in self.live(symbol):
+                self.closed[order["order_id"]] = timestamp
+
+                self.remove(order["order_id"])
+
+    def resting_quantity(self, symbol: str, side: typing.Literal["BUY", "SELL"]):
+        return self.resting.get((symbol, side), 0.0)
+
+    def resting_notional(self, symbol: str, side: typing.Literal["BUY", "SELL"]):
+        return self.notional.get((symbol, side), 0.0)
+
+    def update(self, executionreport: ws.ExecutionReport) -> Order | None:
+        data = executionreport["data"]
+
+        with self.lock:
+            existing = self.orders.get(data["orderId"])
+
+            if existing is not None and existing["timestamp"] > data["timestamp"]:
+                return existing
+
+            if data["status"] in CLOSED:
+                self.closed[data["orderId"]] = data["timestamp"]
+
+                if len(self.closed) > 10000:
+                    del self.closed[next(iter(self.closed))]
+
+                return self.remove(data["orderId"])
+
+            if data["orderId"] in self.closed:
+                return None
+
+            order: Order = {
+                "order_id": data["orderId"],
+                "client_order_id": data["clientOrderId"] or None,
+                "symbol": data["symbol"],
+                "side": data["side"],
+                "price": data["price"],
+                "quantity": data["quantity"],
+                "executed": data["totalExecutedQuantity"],
+                "status": data["status"],
+                "timestamp": data["timestamp"],
+            }
+
+            self.put(order)
+
+            return order
+
+    def reconcile(
+        self,
+        rows: typing.List[rest.GetOrdersResponseRow],
+        since: int,
+        symbol: str | None = None,
+    ):
+        # rows are every open order (of symbol, if given) as of a request issued at
+        # `since` (ms). Stream updates applied after that take precedence.
+        with self.lock:
+            live = {row["order_id"] for row in rows}
+
+            for order in self.live(symbol):
+                if order["order_id"] not in live and order["timestamp"] < since:
+                    self.remove(order["order_id"])
+
+            for row in rows:
+                timestamp = int(float(row["updated_time"]) * 1000)
+
+                if self.closed.get(row["order_id"], 0) >= since:
+                    continue
+
+                # Market orders never rest, so open orders are all priced
+                if row["price"] is None or row["quantity"] is None:
+                    continue
+
+                existing = self.orders.get(row["order_id"])
+
+                if existing is not None and existing["timestamp"] >= timestamp:
+                    continue
+
+                self.put(
+                    {
+                        "order_id": row["order_id"],
+                        "client_order_id": row["client_order_id"] or None,
+                        "symbol": row["symbol"],
+                        "side": row["side"],
+                        "price": row["price"],
+                        "quantity": row["quantity"],
+                        "executed": row["executed"],
+                        "status": row["status"],
+                        "timestamp": timestamp,
+                    }
+                )
+
+            self.closed = {
+                order_id: timestamp
+                for order_id, timestamp in self.closed.items()
+                if timestamp >= since
+            }
+
+    def fetch(self, client: "Client", symbol: str | None = None):
+        since = int(time.time() * 1000)
+
+        params: rest.GetOrdersParams = {"status": "INCOMPLETE"}
+
+        if symbol is not None:
+            params["symbol"] = symbol
+
+        rows: typing.List[rest.GetOrdersResponseRow] = []
+
+        for page in itertools.count(1):
+            response = client.get_orders(**params, page=page)
+
+            rows.extend(response["rows"])
+
+            meta = response["meta"]
+
+            if page * meta["records_per_page"] >= meta["total"]:
+                break
+
+        self.reconcile(rows, since, symbol)
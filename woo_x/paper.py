@@ -0,0 +1,523 @@
+import itertools
+import queue
+import threading
+import time
+import typing
+
+import requests
+
+from woo_x.client import Client
+from woo_x.feed import MarketData
+from woo_x.orderbook import Orderbook
+from woo_x.types import rest, ws
+
+
+class PaperOrder:
+    __slots__ = (
+        "order_id",
+        "client_order_id",
+        "symbol",
+        "side",
+        "type",
+        "price",
+        "quantity",
+        "executed",
+        "queue_ahead",
+        "tag",
+        "created",
+        "timestamp",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        client_order_id: int,
+        symbol: str,
+        side: typing.Literal["BUY", "SELL"],
+        type: str,
+        price: float | None,
+        quantity: float,
+    ):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = type
+        self.price = price
+        self.quantity = quantity
+        self.executed = 0.0
+        self.queue_ahead = 0.0  # Estimated size resting ahead of this order
+        self.tag = ""
+        self.created = self.timestamp = int(time.time() * 1000)
+
+    def remaining(self) -> float:
+        return self.quantity - self.executed
+
+
+# Stands in for a Client, simulating the account's orders against the live local
+# books & public trades instead of sending them. Executions, positions & balances
+# come out of the same executionreport, position & balance generators, and the
+# same snapshot endpoints, as from the exchange. Public endpoints & streams are
+# the real ones, so no credentials are needed.
+class PaperClient(Client):
+    def __init__(
+        self,
+        environment: typing.Literal["production", "staging"],
+        application_id: str = "",
+        public_api_key: str = "",
+        secret_api_key: str = "",
+        balances: dict[str, float] | None = None,
+        maker_fee: float = 0.0,
+        taker_fee: float = 0.0003,
+        market_data: MarketData | None = None,
+        **kwargs,
+    ):
+        super().__init__(
+            environment, application_id, public_api_key, secret_api_key, **kwargs
+        )
+
+        self.market_data = market_data or MarketData(self, self.cpus)
+        self.balances = dict(balances or {})
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.lock = threading.RLock()
+        self.paper_orders: dict[int, PaperOrder] = {}
+        self.paper_positions: dict[str, float] = {}
+        self.books: dict[str, Orderbook] = {}
+        self.tracked: dict[str, threading.Event] = {}  # Set once the book is built
+        self.order_ids = itertools.count(1)
+        self.trade_ids = itertools.count(1)
+        self.subscribers: dict[str, typing.List[queue.SimpleQueue]] = {
+            "executionreport": [],
+            "position": [],
+            "balance": [],
+        }
+
+    def subscribe(self, topic: str) -> typing.Iterable:
+        q: queue.SimpleQueue = queue.SimpleQueue()
+
+        with self.lock:
+            self.subscribers[topic].append(q)
+
+        def messages():
+            while True:
+                yield q.get()
+
+        return messages()
+
+    def emit(self, topic: str, message: dict):
+        for subscriber in self.subscribers[topic]:
+            subscriber.put(message)
+
+    def executionreport(self, *, as_records: bool = False):
+        return self.subscribe("executionreport")
+
+    def position(self, *, as_records: bool = False):
+        return self.subscribe("position")
+
+    def balance(self, *, as_records: bool = False):
+        return self.subscribe("balance")
+
+    def track(self, symbol: str, timeout: float = 10):
+        with self.lock:
+            if symbol not in self.tracked:
+                self.tracked[symbol] = threading.Event()
+
+                threading.Thread(
+                    target=self.track_orderbook, args=[symbol], daemon=True
+                ).start()
+                threading.Thread(
+                    target=self.track_trades, args=[symbol], daemon=True
+                ).start()
+
+        if not self.tracked[symbol].wait(timeout):
+            raise requests.HTTPError(f"Paper orderbook for {symbol} isn't ready")
+
+    def track_orderbook(self, symbol: str):
+        for orderbook in self.market_data.orderbooks(symbol):
+            with self.lock:
+                self.books[symbol] = orderbook
+
+                self.tracked[symbol].set()
+
+                self.match_book(symbol, orderbook)
+
+    def track_trades(self, symbol: str):
+        for trade in self.market_data.trade(symbol):
+            with self.lock:
+                self.match_trade(trade["data"])
+
+    def report(
+        self,
+        order: PaperOrder,
+        status: str,
+        executed_price: float = 0.0,
+        executed_quantity: float = 0.0,
+        fee: float = 0.0,
+        maker: bool = False,
+        trade_id: int = 0,
+    ):
+        order.timestamp = int(time.time() * 1000)
+
+        executionreport = {
+            "topic": "executionreport",
+            "ts": order.timestamp,
+            "data": {
+                "symbol": order.symbol,
+                "clientOrderId": order.client_order_id,
+                "orderId": order.order_id,
+                "type": order.type,
+                "side": order.side,
+                "quantity": order.quantity,
+                "price": order.price or 0.0,
+                "tradeId": trade_id,
+                "executedPrice": executed_price,
+                "executedQuantity": executed_quantity,
+                "fee": fee,
+                "feeAsset": order.symbol.split("_")[-1],
+                "totalExecutedQuantity": order.executed,
+                "avgPrice": 0.0,
+                "status": status,
+                "reason": "",
+                "orderTag": order.tag,
+                "totalFee": 0.0,
+                "visible": order.quantity,
+                "timestamp": order.timestamp,
+                "reduceOnly": False,
+                "maker": maker,
+            },
+        }
+
+        self.emit("executionreport", executionreport)
+
+    def fill(self, order: PaperOrder, price: float, quantity: float, maker: bool):
+        _, base, quote = order.symbol.split("_")
+
+        fee = price * quantity * (self.maker_fee if maker else self.taker_fee)
+        signed = quantity if order.side == "BUY" else -quantity
+
+        order.executed += quantity
+
+        self.report(
+            order,
+            "FILLED" if order.remaining() <= 1e-12 else "PARTIAL_FILLED",
+            price,
+            quantity,
+            fee,
+            maker,
+            next(self.trade_ids),
+        )
+
+        now = int(time.time() * 1000)
+
+        if order.symbol.startswith("SPOT_"):
+            self.balances[base] = self.balances.get(base, 0.0) + signed
+            self.balances[quote] = self.balances.get(quote, 0.0) - signed * price - fee
+            changed = [base, quote]
+        else:
+            self.paper_positions[order.symbol] = (
+                self.paper_positions.get(order.symbol, 0.0) + signed
+            )
+            self.balances[quote] = self.balances.get(quote, 0.0) - fee
+            changed = [quote]
+
+            self.emit(
+                "position",
+                {
+                    "topic": "position",
+                    "ts": now,
+                    "data": {
+                        "positions": {
+                            order.symbol: {
+                                "holding": self.paper_positions[order.symbol]
+                            }
+                        }
+                    },
+                },
+            )
+
+        self.emit(
+            "balance",
+            {
+                "topic": "balance",
+                "ts": now,
+                "data": {
+                    "balances": {
+                        token: {"holding": self.balances[token]} for token in changed
+                    }
+                },
+            },
+        )
+
+        if order.remaining() <= 1e-12:
+            self.paper_orders.pop(order.order_id, None)
+
+    def take(self, order: PaperOrder, orderbook: Orderbook):
+        # Walks the opposite side up to the order's limit, as a taker
+        levels = orderbook.asks if order.side == "BUY" else orderbook.bids
+
+        for price, size in list(itertools.islice(levels.items(), 100)):
+            if order.remaining() <= 1e-12 or not self.crosses(order, price):
+                break
+
+            self.fill(order, price, min(size, order.remaining()), False)
+
+    def crosses(self, order: PaperOrder, price: float) -> bool:
+        if order.price is None:
+            return True
+
+        return price <= order.price if order.side == "BUY" else price >= order.price
+
+    def fillable(self, order: PaperOrder, orderbook: Orderbook) -> float:
+        levels = orderbook.asks if order.side == "BUY" else orderbook.bids
+
+        available = 0.0
+
+        for price, size in itertools.islice(levels.items(), 100):
+            if not self.crosses(order, price):
+                break
+
+            available += size
+
+        return available
+
+    def place(self, order: PaperOrder, orderbook: Orderbook):
+        # Joins the back of the queue at its price
+        levels = orderbook.bids if order.side == "BUY" else orderbook.asks
+
+        order.queue_ahead = levels.get(order.price, 0.0)
+
+        self.paper_orders[order.order_id] = order
+
+    def match_book(self, symbol: str, orderbook: Orderbook):
+        if not orderbook.bids or not orderbook.asks:
+            return
+
+        best_bid = orderbook.bids.peekitem(0)[0]
+        best_ask = orderbook.asks.peekitem(0)[0]
+
+        # Only limit orders rest, so every order here has a price
+        for order in list(self.paper_orders.values()):
+            if order.symbol != symbol or order.price is None:
+                continue
+
+            # The book moving through the order means it was filled at its price
+            if order.side == "BUY" and best_ask <= order.price:
+                self.fill(order, order.price, order.remaining(), True)
+            elif order.side == "SELL" and best_bid >= order.price:
+                self.fill(order, order.price, order.remaining(), True)
+            else:
+                # Whatever left the level may have been ahead of the order, so the
+                # queue ahead can only shrink to what's left
+                levels = orderbook.bids if order.side == "BUY" else orderbook.asks
+
+                order.queue_ahead = min(order.queue_ahead, levels.get(order.price, 0.0))
+
+    def match_trade(self, trade: ws.TradeData):
+        for order in list(self.paper_orders.values()):
+            if order.symbol != trade["symbol"] or order.side == trade["side"]:
+                continue
+
+            if order.price is None or not self.crosses(order, trade["price"]):
+                continue
+
+            size = trade["size"]
+
+            if trade["price"] == order.price:
+                # Trades at the order's price fill whatever is queued ahead first
+                size, order.queue_ahead = (
+                    max(size - order.queue_ahead, 0.0),
+                    max(order.queue_ahead - size, 0.0),
+                )
+
+            if size > 0:
+                self.fill(order, order.price, min(size, order.remaining()), True)
+
+    def send_order(self, content: rest.SendOrderParams) -> rest.SendOrderResponse:
+        symbol = content["symbol"]
+
+        self.track(symbol)
+
+        with self.lock:
+            orderbook = self.books[symbol]
+
+            order = PaperOrder(
+                next(self.order_ids),
+                content.get("client_order_id", 0),
+                symbol,
+                content["side"],
+                content["order_type"],
+                content.get("order_price"),
+                content.get("order_quantity", 0.0),
+            )
+
+            order.tag = content.get("order_tag", "")
+
+            self.report(order, "NEW")
+
+            match order.type:
+                case "POST_ONLY" if self.fillable(order, orderbook):
+                    self.report(order, "CANCELLED")
+                case "FOK" if self.fillable(order, orderbook) < order.quantity:
+                    self.report(order, "CANCELLED")
+                case "MARKET" | "IOC" | "FOK":
+                    self.take(order, orderbook)
+
+                    if order.remaining() > 1e-12:
+                        self.report(order, "CANCELLED")
+                case _:
+                    self.take(order, orderbook)
+
+                    if order.remaining() > 1e-12:
+                        self.place(order, orderbook)
+
+            return {
+                "success": True,
+                "timestamp": str(order.created / 1000),
+                "order_id": order.order_id,
+                "order_type": content["order_type"],
+                "order_price": order.price or 0.0,
+                "order_quantity": order.quantity,
+                "order_amount": None,
+                "client_order_id": order.client_order_id,
+            }
+
+    def cancel(self, order: PaperOrder | None):
+        if order is None:
+            raise requests.HTTPError("Paper order not found")
+
+        del self.paper_orders[order.order_id]
+
+        self.report(order, "CANCELLED")
+
+    def find(self, client_order_id: int) -> PaperOrder | None:
+        for order in self.paper_orders.values():
+            if order.client_order_id == client_order_id:
+                return order
+
+        return None
+
+    def cancel_order(self, content: rest.CancelOrderParams) -> rest.CancelOrderResponse:
+        with self.lock:
+            self.cancel(self.paper_orders.get(content["order_id"]))
+
+        return {"success": True, "status": "CANCEL_SENT"}
+
+    def cancel_order_by_client_order_id(self, client_order_id: int, symbol: str):
+        with self.lock:
+            self.cancel(self.find(client_order_id))
+
+        return {"success": True, "status": "CANCEL_SENT"}
+
+    def cancel_orders(self, symbol: str):
+        with self.lock:
+            for order in list(self.paper_orders.values()):
+                if order.symbol == symbol:
+                    self.cancel(order)
+
+        return {"success": True, "status": "CANCEL_ALL_SENT"}
+
+    def edit(self, order: PaperOrder | None, price: str, quantity: str):
+        if order is None:
+            raise requests.HTTPError("Paper order not found")
+
+        price_, quantity_ = float(price), float(quantity)
+
+        if quantity_ <= order.executed:
+            raise requests.HTTPError("Paper order quantity below executed")
+
+        orderbook = self.books[order.symbol]
+
+        repriced = price_ != order.price
+
+        order.price, order.quantity = price_, quantity_
+
+        self.report(order, "NEW")
+
+        if repriced:  # Loses its queue priority
+            del self.paper_orders[order.order_id]
+
+            self.take(order, orderbook)
+
+            if order.remaining() > 1e-12:
+                self.place(order, orderbook)
+
+        return {"success": True, "status": "EDIT_SENT"}
+
+    def edit_order(self, order_id: int, price: str, quantity: str):
+        with self.lock:
+            return self.edit(self.paper_orders.get(order_id), price, quantity)
+
+    def edit_order_by_client_order_id(
+        self, client_order_id: int, price: str, quantity: str
+    ):
+        with self.lock:
+            return self.edit(self.find(client_order_id), price, quantity)
+
+    def get_orders(self, **kwargs) -> rest.GetOrdersResponse:
+        with self.lock:
+            rows: typing.List[rest.GetOrdersResponseRow] = [
+                {
+                    "symbol": order.symbol,
+                    "status": "PARTIAL_FILLED" if order.executed else "NEW",
+                    "side": order.side,
+                    "created_time": str(order.created / 1000),
+                    "updated_time": str(order.timestamp / 1000),
+                    "order_id": order.order_id,
+                    "order_tag": order.tag,
+                    "price": order.price,
+                    "type": order.type,
+                    "quantity": order.quantity,
+                    "amount": None,
+                    "visible": order.quantity,
+                    "executed": order.executed,
+                    "total_fee": 0.0,
+                    "fee_asset": order.symbol.split("_")[-1],
+                    "client_order_id": order.client_order_id,
+                    "reduce_only": False,
+                    "average_executed_price": None,
+                }
+                for order in self.paper_orders.values()
+                if kwargs.get("symbol", order.symbol) == order.symbol
+            ]
+
+        return {
+            "success": True,
+            "meta": {
+                "total": len(rows),
+                "records_per_page": max(len(rows), 1),
+                "current_page": 1,
+            },
+            "rows": rows,
+        }
+
+    def get_all_position_info(self) -> rest.PositionsResponse:
+        with self.lock:
+            now = time.time()
+
+            return typing.cast(
+                rest.PositionsResponse,
+                {
+                    "success": True,
+                    "data": {
+                        "positions": [
+                            {"symbol": symbol, "holding": holding, "timestamp": now}
+                            for symbol, holding in self.paper_positions.items()
+                        ]
+                    },
+                    "timestamp": int(now * 1000),
+                },
+            )
+
+    def get_current_holding(self):
+        with self.lock:
+            return {
+                "success": True,
+                "data": {
+                    "holding": [
+                        {"token": token, "holding": holding}
+                        for token, holding in self.balances.items()
+                    ]
+                },
+                "timestamp": int(time.time() * 1000),
+            }
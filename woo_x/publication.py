@@ -0,0 +1,167 @@
+import itertools
+import mmap
+import os
+import struct
+import tempfile
+import time
+import typing
+
+from woo_x.orderbook import Orderbook
+
+MAGIC = b"WOOXBOOK"
+
+LAYOUT_VERSION = 1
+
+# magic, layout version, depth
+HEADER = struct.Struct("<8sII")
+
+# Seqlock sequence: odd while the writer is mid-update, even once consistent
+SEQUENCE = struct.Struct("<Q")
+
+
+def body(depth: int) -> struct.Struct:
+    # timestamp, bid levels, ask levels, then depth (price, size) pairs per side
+    return struct.Struct(f"<qII{depth * 4}d")
+
+
+def path(symbol: str, directory: str | None = None) -> str:
+    if directory is None:
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+    return os.path.join(directory, f"woo_x_book_{symbol}")
+
+
+class BookPublisher:
+    def __init__(self, symbol: str, depth: int = 10, directory: str | None = None):
+        self.symbol = symbol
+        self.depth = depth
+        self.path = path(symbol, directory)
+        self.body = body(depth)
+        self.sequence = 0
+        self.empty = (0.0, 0.0) * depth
+
+        size = HEADER.size + SEQUENCE.size + self.body.size
+
+        with open(self.path, "w+b") as file:
+            file.truncate(size)
+
+            self.mmap = mmap.mmap(file.fileno(), size)
+
+        HEADER.pack_into(self.mmap, 0, MAGIC, LAYOUT_VERSION, depth)
+        SEQUENCE.pack_into(self.mmap, HEADER.size, self.sequence)
+
+    def publish(self, orderbook: Orderbook):
+        bids = list(
+            itertools.chain.from_iterable(
+                itertools.islice(orderbook.bids.items(), self.depth)
+            )
+        )
+
+        asks = list(
+            itertools.chain.from_iterable(
+                itertools.islice(orderbook.asks.items(), self.depth)
+            )
+        )
+
+        offset = HEADER.size + SEQUENCE.size
+
+        SEQUENCE.pack_into(self.mmap, HEADER.size, self.sequence + 1)
+
+        self.body.pack_into(
+            self.mmap,
+            offset,
+            orderbook.timestamp,
+            len(bids) // 2,
+            len(asks) // 2,
+            *bids,
+            *self.empty[len(bids) :],
+            *asks,
+            *self.empty[len(asks) :],
+        )
+
+        self.sequence += 2
+
+        SEQUENCE.pack_into(self.mmap, HEADER.size, self.sequence)
+
+    def close(self):
+        self.mmap.close()
+
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class BookReader:
+    def __init__(self, symbol: str, directory: str | None = None):
+        self.symbol = symbol
+        self.path = path(symbol, directory)
+
+        with open(self.path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, layout_version, self.depth = HEADER.unpack_from(self.mmap, 0)
+
+        if magic != MAGIC or layout_version != LAYOUT_VERSION:
+            raise ValueError(
+                f"{self.path} is not a version {LAYOUT_VERSION} book publication"
+            )
+
+        self.body = body(self.depth)
+
+    def version(self) -> int:
+        # Cheap to poll: only changes once a new book has been fully published
+        return SEQUENCE.unpack_from(self.mmap, HEADER.size)[0]
+
+    def read(
+        self, timeout: float = 1
+    ) -> typing.Tuple[
+        int,
+        typing.List[typing.Tuple[float, float]],
+        typing.List[typing.Tuple[float, float]],
+    ]:
+        # Raises TimeoutError if no consistent book can be read within timeout
+        # seconds, e.g as the publisher died part way through publishing one
+        offset = HEADER.size + SEQUENCE.size
+        deadline = time.monotonic() + timeout
+
+        while True:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{self.path} stayed mid-publish for {timeout}s")
+
+            before = self.version()
+
+            if before & 1:
+                time.sleep(0)  # Yields to the publisher
+
+                continue
+
+            timestamp, bid_levels, ask_levels, *levels = self.body.unpack_from(
+                self.mmap, offset
+            )
+
+            if self.version() == before:
+                break
+
+        bids = levels[: self.depth * 2]
+        asks = levels[self.depth * 2 :]
+
+        return (
+            timestamp,
+            list(zip(bids[0 : bid_levels * 2 : 2], bids[1 : bid_levels * 2 : 2])),
+            list(zip(asks[0 : ask_levels * 2 : 2], asks[1 : ask_levels * 2 : 2])),
+        )
+
+    def bbo(
+        self,
+    ) -> typing.Tuple[typing.Tuple[float, float], typing.Tuple[float, float]] | None:
+        # None while either side of the book is empty
+        _, bids, asks = self.read()
+
+        if not bids or not asks:
+            return None
+
+        return bids[0], asks[0]
+
+    def close(self):
+        self.mmap.close()
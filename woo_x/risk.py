@@ -0,0 +1,164 @@
+import logging
+import math
+import typing
+
+from woo_x import ticks
+from woo_x.metadata import Metadata
+from woo_x.orders import OrderIndex
+from woo_x.types import rest
+
+
+class Limits(typing.TypedDict, total=False):
+    max_order_notional: float
+    max_position: float  # Absolute, in base currency, counting resting orders
+
+
+class RiskGate:
+    # Validates & normalizes orders against the symbol's trading rules, positions,
+    # balances and configured limits, before they're sent. positions & balances
+    # are live {symbol or token: (holding, last_updated)} mappings, and frozen the
+    # part of each balance held by open orders.
+    def __init__(
+        self,
+        metadata: Metadata,
+        positions: dict[str, typing.Tuple[float, float]],
+        balances: dict[str, typing.Tuple[float, float]],
+        orders: OrderIndex | None = None,
+        limits: dict[str, Limits] | None = None,
+        frozen: dict[str, float] | None = None,
+    ):
+        self.metadata = metadata
+        self.positions = positions
+        self.balances = balances
+        self.orders = orders
+        self.limits = limits or {}
+        self.frozen = frozen if frozen is not None else {}
+
+    def available(self, token: str, released: float = 0) -> float:
+        # The balance not frozen by open orders, other than those being released
+        holding = self.balances.get(token, (0.0, 0))[0]
+
+        return holding - max(self.frozen.get(token, 0.0) - released, 0.0)
+
+    def replaced(
+        self, symbol: str, side: typing.Literal["BUY", "SELL"]
+    ) -> typing.Tuple[float, float]:
+        # Quantity & notional of symbol's open orders on side
+        if self.orders is None:
+            return 0.0, 0.0
+
+        with self.orders.lock:
+            return (
+                self.orders.resting_quantity(symbol, side),
+                self.orders.resting_notional(symbol, side),
+            )
+
+    def check(
+        self,
+        order: rest.SendOrderParams,
+        batched: float = 0,
+        batched_notional: float = 0,
+        replacing: bool = False,
+    ) -> rest.SendOrderParams:
+        # batched: quantity on the same side already accepted for sending alongside
+        # this order but not yet resting on the book. replacing: whether the
+        # symbol's open orders are all to be cancelled or adopted in its place, so
+        # neither their quantity nor the balance they freeze count against it
+        symbol = order["symbol"]
+        side = order["side"]
+        rules = self.metadata.symbol(symbol)
+        limits = self.limits.get(symbol, {})
+        order = typing.cast(rest.SendOrderParams, dict(order))
+
+        if "order_price" in order:
+            # Rounded away from the other side of the book, never more aggressive
+            rounding = ticks.floor if side == "BUY" else ticks.ceil
+            order["order_price"] = price = rounding(
+                order["order_price"], rules["quote_tick"]
+            )
+
+            if not rules["quote_min"] <= price <= rules["quote_max"]:
+                raise ValueError(f"Price {price} out of range for {symbol}")
+        else:
+            price = None
+
+        if "order_quantity" in order:
+            order["order_quantity"] = quantity = ticks.floor(
+                order["order_quantity"], rules["base_tick"]
+            )
+
+            if not rules["base_min"] <= quantity <= rules["base_max"]:
+                raise ValueError(f"Quantity {quantity} out of range for {symbol}")
+        else:
+            quantity = None
+
+        if price is not None and quantity is not None:
+            notional = price * quantity
+
+            if notional < rules["min_notional"]:
+                raise ValueError(f"Notional {notional} below minimum for {symbol}")
+
+            if notional > limits.get("max_order_notional", math.inf):
+                raise ValueError(f"Notional {notional} above limit for {symbol}")
+
+        if quantity is not None and "max_position" in limits:
+            position = self.positions.get(symbol, (0.0, 0))[0]
+
+            resting = (
+                self.orders.resting_quantity(symbol, side)
+                if self.orders and not replacing
+                else 0.0
+            )
+
+            exposure = quantity + batched + resting
+
+            if side == "BUY" and position + exposure > limits["max_position"]:
+                raise ValueError(f"Buying {quantity} would exceed position limit")
+
+            if side == "SELL" and position - exposure < -limits["max_position"]:
+                raise ValueError(f"Selling {quantity} would exceed position limit")
+
+        if symbol.startswith("SPOT_") and quantity is not None:
+            _, base, quote = symbol.split("_")
+
+            released = self.replaced(symbol, side) if replacing else (0.0, 0.0)
+
+            if side == "SELL":
+                if quantity + batched > self.available(base, released[0]):
+                    raise ValueError(f"Insufficient {base} balance to sell {quantity}")
+            elif price is not None:
+                required = price * quantity + batched_notional
+
+                if required > self.available(quote, released[1]):
+                    raise ValueError(f"Insufficient {quote} balance to buy {quantity}")
+
+        return order
+
+    def check_all(
+        self, orders: typing.List[rest.SendOrderParams], replacing: bool = False
+    ) -> typing.List[rest.SendOrderParams]:
+        # Rejected orders are logged & dropped from the batch
+        accepted = []
+
+        batched: dict[typing.Tuple[str, str], typing.Tuple[float, float]] = {}
+
+        for order in orders:
+            key = (order["symbol"], order["side"])
+
+            quantity, notional = batched.get(key, (0.0, 0.0))
+
+            try:
+                order = self.check(order, quantity, notional, replacing)
+            except ValueError as e:
+                logging.warning(f"Order rejected before sending: {e} ({order})")
+
+                continue
+
+            batched[key] = (
+                quantity + order.get("order_quantity", 0),
+                notional + order.get("order_price", 0) * order.get("order_quantity", 0),
+            )
+
+            accepted.append(order)
+
+        return accepted
@@ -0,0 +1,92 @@
+import gc
+import logging
+import os
+import threading
+import time
+import typing
+
+
+def pin(cpus: typing.List[int] | None):
+    # Pins the calling thread, as on Linux a pid of 0 is the calling thread
+    if not cpus:
+        return
+
+    if not hasattr(os, "sched_setaffinity"):
+        logging.warning("CPU affinity isn't supported on this platform")
+
+        return
+
+    os.sched_setaffinity(0, cpus)
+
+
+class GCControl:
+    # Times every cyclic garbage collection, and optionally takes collections off
+    # the trading threads' hands: "disabled" never collects automatically, while
+    # "scheduled" only collects when idle() is called between quotes, going as
+    # deep as the usual thresholds would have
+    def __init__(
+        self, mode: typing.Literal["default", "disabled", "scheduled"] = "default"
+    ):
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.started: float | None = None
+        self.collections = [0, 0, 0]  # Per generation
+        self.total = 0.0  # Seconds
+        self.max = 0.0
+        self.last = 0.0
+
+        gc.callbacks.append(self.callback)
+
+        if mode != "default":
+            gc.disable()
+
+    def callback(self, phase: str, info: dict):
+        if phase == "start":
+            self.started = time.perf_counter()
+
+            return
+
+        if self.started is None:
+            return
+
+        pause = time.perf_counter() - self.started
+
+        self.started = None
+
+        self.collections[info["generation"]] += 1
+        self.total += pause
+        self.max = max(self.max, pause)
+        self.last = pause
+
+    def freeze(self):
+        # Moves everything allocated so far, i.e while bootstrapping, out of every
+        # future collection's way
+        gc.collect()
+        gc.freeze()
+
+    def idle(self):
+        if self.mode != "scheduled" or not self.lock.acquire(blocking=False):
+            return
+
+        try:
+            count, threshold = gc.get_count(), gc.get_threshold()
+
+            generation = next(
+                (i for i in (2, 1) if count[i] >= threshold[i]),
+                0 if count[0] >= threshold[0] else None,
+            )
+
+            if generation is not None:
+                gc.collect(generation)
+        finally:
+            self.lock.release()
+
+    def metrics(self):
+        return {
+            "mode": self.mode,
+            "collections": list(self.collections),
+            "total_ms": self.total * 1000,
+            "max_ms": self.max * 1000,
+            "last_ms": self.last * 1000,
+            "frozen": gc.get_freeze_count(),
+        }
@@ -0,0 +1,328 @@
+import logging
+import multiprocessing
+import multiprocessing.process
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import typing
+
+from woo_x.client import Client
+from woo_x.runtime import pin
+from woo_x.types import ws
+
+
+def shards(
+    symbols: typing.List[str], processes: int, weights: dict[str, float]
+) -> typing.List[typing.List[str]]:
+    loads = [0.0] * processes
+
+    assignment: typing.List[typing.List[str]] = [[] for _ in range(processes)]
+
+    # Heaviest symbols first, each onto whichever shard is currently the lightest
+    for symbol in sorted(symbols, key=lambda s: weights.get(s, 1.0), reverse=True):
+        i = loads.index(min(loads))
+
+        assignment[i].append(symbol)
+
+        loads[i] += weights.get(symbol, 1.0)
+
+    return [shard for shard in assignment if shard]
+
+
+# Worker side of a Supervisor: serves the routed private streams through the same
+# generator methods as Client, so it can stand in for one in an OrderManager
+class Shard:
+    def __init__(
+        self,
+        index: int,
+        symbols: typing.List[str],
+        events: multiprocessing.Queue,
+        metrics: multiprocessing.Queue,
+    ):
+        self.index = index
+        self.symbols = symbols
+        self.events = events
+        self.metrics = metrics
+        self.lock = threading.Lock()
+        self.subscribers: dict[str, typing.List[queue.Queue]] = {
+            "executionreport": [],
+            "position": [],
+            "balance": [],
+        }
+        self.reconnect_listeners: typing.List[typing.Callable[[str], None]] = []
+
+        threading.Thread(target=self.dispatch, daemon=True).start()
+        threading.Thread(target=self.watch_parent, daemon=True).start()
+
+    def watch_parent(self):
+        # Without the supervisor nothing routes the private streams any more, so
+        # the worker shuts down - through SIGTERM, to cancel its orders on the way
+        parent = multiprocessing.parent_process()
+
+        if parent is None:
+            return
+
+        parent.join()
+
+        logging.warning(f"Supervisor gone, stopping shard #{self.index}")
+
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def dispatch(self):
+        while True:
+            topic, message = self.events.get()
+
+            if topic == "reconnect":
+                for listener in self.reconnect_listeners:
+                    listener(message)
+
+                continue
+
+            with self.lock:
+                subscribers = list(self.subscribers[topic])
+
+            for subscriber in subscribers:
+                subscriber.put_nowait(message)
+
+    def subscribe(self, topic: str) -> typing.Iterable[typing.Any]:
+        # Registered eagerly so nothing routed between the call and the first
+        # iteration is lost
+        q: queue.Queue = queue.Queue()
+
+        with self.lock:
+            self.subscribers[topic].append(q)
+
+        def messages():
+            while True:
+                yield q.get()
+
+        return messages()
+
+    def on_reconnect(self, listener: typing.Callable[[str], None]):
+        self.reconnect_listeners.append(listener)
+
+    def executionreport(self) -> typing.Iterable[ws.ExecutionReport]:
+        return self.subscribe("executionreport")
+
+    def position(self) -> typing.Iterable[ws.Position]:
+        return self.subscribe("position")
+
+    def balance(self) -> typing.Iterable[ws.Balance]:
+        return self.subscribe("balance")
+
+    def report(self, metrics: dict):
+        self.metrics.put_nowait((self.index, time.time(), metrics))
+
+
+def run_shard(
+    target: typing.Callable[[Shard], None],
+    index: int,
+    symbols: typing.List[str],
+    events: multiprocessing.Queue,
+    metrics: multiprocessing.Queue,
+):
+    target(Shard(index, symbols, events, metrics))
+
+
+class Supervisor:
+    def __init__(
+        self,
+        client: Client,
+        target: typing.Callable[[Shard], None],
+        symbols: typing.List[str],
+        processes: int,
+        weights: dict[str, float] | None = None,
+        interval: float = 1,
+        max_backoff: float = 60,
+        report_interval: float = 60,
+        cpus: typing.List[int] | None = None,
+    ):
+        self.client = client
+        self.target = target
+        self.shards = shards(symbols, processes, weights or {})
+        self.owners = {
+            symbol: i for i, shard in enumerate(self.shards) for symbol in shard
+        }
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.report_interval = report_interval
+        self.cpus = cpus  # To pin the private stream routing threads to
+
+        # Workers are spawned rather than forked as the parent runs stream threads
+        self.context = multiprocessing.get_context("spawn")
+        self.inboxes = [self.context.Queue() for _ in self.shards]
+        self.metrics_queue = self.context.Queue()
+
+        self.workers: typing.List[multiprocessing.process.BaseProcess | None] = [
+            None
+        ] * len(self.shards)
+        self.started_at = [0.0] * len(self.shards)
+        self.restarts = [0] * len(self.shards)
+        self.crashes = [0] * len(self.shards)  # Consecutive, reset once stable
+        self.metrics: dict[int, dict] = {}
+
+    def start(self, i: int):
+        worker = self.context.Process(
+            target=run_shard,
+            args=(self.target, i, self.shards[i], self.inboxes[i], self.metrics_queue),
+            name=f"shard-{i}",
+            daemon=True,
+        )
+
+        worker.start()
+
+        self.workers[i] = worker
+        self.started_at[i] = time.monotonic()
+
+        logging.info(f"Started shard #{i} (pid {worker.pid}): {self.shards[i]}")
+
+    def route_executionreport(self):
+        pin(self.cpus)
+
+        for executionreport in self.client.executionreport():
+            owner = self.owners.get(executionreport["data"]["symbol"])
+
+            if owner is not None:
+                self.inboxes[owner].put_nowait(("executionreport", executionreport))
+
+    def route_position(self):
+        pin(self.cpus)
+
+        for position in self.client.position():
+            routed: dict[int, dict[str, ws.PositionDataPosition]] = {}
+
+            for symbol, data in position["data"]["positions"].items():
+                owner = self.owners.get(symbol)
+
+                if owner is not None:
+                    routed.setdefault(owner, {})[symbol] = data
+
+            for owner, positions in routed.items():
+                message: ws.Position = {
+                    "topic": position["topic"],
+                    "ts": position["ts"],
+                    "data": {"positions": positions},
+                }
+
+                self.inboxes[owner].put_nowait(("position", message))
+
+    def route_balance(self):
+        # Balances are per token rather than per symbol, so every shard needs them
+        pin(self.cpus)
+
+        for balance in self.client.balance():
+            for inbox in self.inboxes:
+                inbox.put_nowait(("balance", balance))
+
+    def route_reconnect(self, subscription: str):
+        for inbox in self.inboxes:
+            inbox.put_nowait(("reconnect", subscription))
+
+    def collect_metrics(self):
+        while True:
+            i, timestamp, metrics = self.metrics_queue.get()
+
+            self.metrics[i] = {
+                "pid": self.workers[i].pid if self.workers[i] else None,
+                "symbols": self.shards[i],
+                "restarts": self.restarts[i],
+                "timestamp": timestamp,
+                "metrics": metrics,
+            }
+
+    def summary(self) -> dict[int, dict]:
+        # The latest metrics reported by each shard, with how many seconds ago
+        now = time.time()
+
+        return {
+            i: {
+                "pid": shard["pid"],
+                "symbols": shard["symbols"],
+                "restarts": shard["restarts"],
+                "age": now - shard["timestamp"],
+                "metrics": shard["metrics"],
+            }
+            for i, shard in dict(self.metrics).items()
+        }
+
+    def report(self):
+        while True:
+            time.sleep(self.report_interval)
+
+            summary = self.summary()
+
+            for i in range(len(self.shards)):
+                if i not in summary or summary[i]["age"] > self.report_interval:
+                    logging.warning(f"Shard #{i} hasn't reported metrics recently")
+
+            logging.info(
+                "Shards: %s",
+                summary,
+                extra={"category": "supervisor", "fields": summary},
+            )
+
+    def stop(self):
+        for worker in self.workers:
+            if worker is not None and worker.is_alive():
+                worker.terminate()
+
+        for worker in self.workers:
+            if worker is not None:
+                worker.join(self.interval * 10)
+
+    def run(self):
+        # Workers are stopped, and so cancel their orders, however the supervisor
+        # exits - SIGTERM included, which would otherwise skip atexit
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
+
+        for i in range(len(self.shards)):
+            self.start(i)
+
+        self.client.on_reconnect(self.route_reconnect)
+
+        threading.Thread(target=self.route_executionreport, daemon=True).start()
+        threading.Thread(target=self.route_position, daemon=True).start()
+        threading.Thread(target=self.route_balance, daemon=True).start()
+        threading.Thread(target=self.collect_metrics, daemon=True).start()
+        threading.Thread(target=self.report, daemon=True).start()
+
+        restart_at: dict[int, float] = {}
+
+        try:
+            while True:
+                now = time.monotonic()
+
+                for i, worker in enumerate(self.workers):
+                    if worker is None:
+                        continue
+
+                    if worker.is_alive():
+                        if now - self.started_at[i] > self.max_backoff:
+                            self.crashes[i] = 0
+
+                        continue
+
+                    if i not in restart_at:
+                        self.crashes[i] += 1
+
+                        backoff = min(2 ** (self.crashes[i] - 1), self.max_backoff)
+
+                        restart_at[i] = now + backoff
+
+                        logging.warning(
+                            f"Shard #{i} exited with code {worker.exitcode}, restarting in {backoff}s"
+                        )
+
+                    if now >= restart_at[i]:
+                        del restart_at[i]
+
+                        self.restarts[i] += 1
+
+                        self.start(i)
+
+                time.sleep(self.interval)
+        finally:
+            self.stop()
@@ -0,0 +1,147 @@
+import array
+import typing
+
+from woo_x.types import ws
+
+
+class Bars:
+    def __init__(self, interval: int, capacity: int = 100):
+        self.interval = interval  # Milliseconds
+        self.capacity = capacity
+        self.start = array.array("q", [0] * capacity)
+        self.open = array.array("d", [0.0] * capacity)
+        self.high = array.array("d", [0.0] * capacity)
+        self.low = array.array("d", [0.0] * capacity)
+        self.close = array.array("d", [0.0] * capacity)
+        self.volume = array.array("d", [0.0] * capacity)
+        self.head = -1  # Index of the bar currently being built
+        self.count = 0
+
+    def update(self, timestamp: int, price: float, size: float):
+        start = timestamp - timestamp % self.interval
+
+        if self.head >= 0 and self.start[self.head] == start:
+            i = self.head
+
+            if price > self.high[i]:
+                self.high[i] = price
+            elif price < self.low[i]:
+                self.low[i] = price
+
+            self.close[i] = price
+            self.volume[i] += size
+
+            return
+
+        i = self.head = (self.head + 1) % self.capacity
+
+        self.start[i] = start
+        self.open[i] = self.high[i] = self.low[i] = self.close[i] = price
+        self.volume[i] = size
+
+        self.count = min(self.count + 1, self.capacity)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(
+        self, age: int
+    ) -> typing.Tuple[int, float, float, float, float, float]:
+        # 0 is the bar currently being built, 1 the last completed one and so on
+        if not 0 <= age < self.count:
+            raise IndexError(age)
+
+        i = (self.head - age) % self.capacity
+
+        return (
+            self.start[i],
+            self.open[i],
+            self.high[i],
+            self.low[i],
+            self.close[i],
+            self.volume[i],
+        )
+
+
+class Tape:
+    def __init__(
+        self,
+        symbol: str,
+        capacity: int = 1000,
+        intervals: typing.Iterable[int] = (1000, 60000),
+        bars: int = 100,
+    ):
+        self.symbol = symbol
+        self.capacity = capacity
+        self.timestamps = array.array("q", [0] * capacity)
+        self.prices = array.array("d", [0.0] * capacity)
+        self.sizes = array.array("d", [0.0] * capacity)
+        self.sides = array.array("b", [0] * capacity)  # 1 for buys, -1 for sells
+        self.head = 0  # Index the next trade is written to
+        self.count = 0
+        self.bars = {interval: Bars(interval, bars) for interval in intervals}
+
+        # Running sums over the trades currently in the buffer
+        self.notional = 0.0
+        self.volume = 0.0
+        self.buy_volume = 0.0
+
+    def update(self, trade: ws.Trade):
+        data = trade["data"]
+
+        price, size = data["price"], data["size"]
+
+        i = self.head
+
+        if self.count == self.capacity:
+            self.notional -= self.prices[i] * self.sizes[i]
+            self.volume -= self.sizes[i]
+
+            if self.sides[i] > 0:
+                self.buy_volume -= self.sizes[i]
+        else:
+            self.count += 1
+
+        self.timestamps[i] = trade["ts"]
+        self.prices[i] = price
+        self.sizes[i] = size
+        self.sides[i] = 1 if data["side"] == "BUY" else -1
+
+        self.notional += price * size
+        self.volume += size
+
+        if self.sides[i] > 0:
+            self.buy_volume += size
+
+        self.head = (i + 1) % self.capacity
+
+        if self.head == 0:
+            # Once per lap, to stop floating point error accumulating in the sums
+            self.notional = sum(p * s for p, s in zip(self.prices, self.sizes))
+            self.volume = sum(self.sizes)
+            self.buy_volume = sum(s for s, d in zip(self.sizes, self.sides) if d > 0)
+
+        for bars in self.bars.values():
+            bars.update(trade["ts"], price, size)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, age: int) -> typing.Tuple[int, float, float, int]:
+        # (timestamp, price, size, side), 0 being the most recent trade
+        if not 0 <= age < self.count:
+            raise IndexError(age)
+
+        i = (self.head - 1 - age) % self.capacity
+
+        return self.timestamps[i], self.prices[i], self.sizes[i], self.sides[i]
+
+    def vwap(self) -> float | None:
+        return self.notional / self.volume if self.volume > 0 else None
+
+    def imbalance(self) -> float | None:
+        # Signed trade flow in [-1, 1]: 1 when every trade in the window was a buy
+        if self.volume <= 0:
+            return None
+
+        return (2 * self.buy_volume - self.volume) / self.volume
@@ -0,0 +1,21 @@
+import decimal
+import functools
+import math
+import typing
+
+# Rounding to a tick size, e.g an order's price to its symbol's quote_tick. The
+# epsilons stop e.g 0.3 / 0.1 = 2.9999999999999996 flooring to 2 ticks, or
+# 0.7 / 0.1 = 7.000000000000001 ceiling to 8.
+
+
+@functools.lru_cache
+def decimals(tick: float) -> int:
+    return max(-typing.cast(int, decimal.Decimal(str(tick)).as_tuple().exponent), 0)
+
+
+def floor(value: float, tick: float) -> float:
+    return round(math.floor(value / tick + 1e-9) * tick, decimals(tick))
+
+
+def ceil(value: float, tick: float) -> float:
+    return round(math.ceil(value / tick - 1e-9) * tick, decimals(tick))
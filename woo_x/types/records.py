@@ -0,0 +1,355 @@
+import typing
+
+from woo_x.types import ws
+
+# Compact __slots__ counterparts of the TypedDicts in woo_x.types.ws, for hot
+# paths where message.data.status beats message["data"]["status"]. Nested
+# TypedDicts (including in dict values) are records too. Only the fields messages
+# can't do without are required, the rest are None when missing. Checked against
+# woo_x.types.ws on import.
+
+
+class Record:
+    __slots__: typing.Tuple[str, ...] = ()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    def asdict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ExecutionReportData(Record):
+    __slots__ = (
+        "symbol",
+        "clientOrderId",
+        "orderId",
+        "type",
+        "side",
+        "quantity",
+        "price",
+        "tradeId",
+        "executedPrice",
+        "executedQuantity",
+        "fee",
+        "feeAsset",
+        "totalExecutedQuantity",
+        "avgPrice",
+        "status",
+        "reason",
+        "orderTag",
+        "totalFee",
+        "visible",
+        "timestamp",
+        "reduceOnly",
+        "maker",
+    )
+
+    symbol: str
+    clientOrderId: int
+    orderId: int
+    type: typing.Literal["LIMIT", "MARKET", "IOC", "FOK", "POST_ONLY", "LIQUIDATE"]
+    side: typing.Literal["BUY", "SELL"]
+    quantity: float
+    price: float
+    tradeId: int | None
+    executedPrice: float | None
+    executedQuantity: float | None
+    fee: float | None
+    feeAsset: str | None
+    totalExecutedQuantity: float | None
+    avgPrice: float | None
+    status: typing.Literal[
+        "NEW",
+        "CANCELLED",
+        "PARTIAL_FILLED",
+        "FILLED",
+        "REJECTED",
+        "INCOMPLETE",
+        "COMPLETED",
+    ]
+    reason: str | None
+    orderTag: str | None
+    totalFee: float | None
+    visible: float | None
+    timestamp: int
+    reduceOnly: bool | None
+    maker: bool | None
+
+    @staticmethod
+    def decode(message: dict) -> "ExecutionReportData":
+        self = object.__new__(ExecutionReportData)
+
+        self.symbol = message["symbol"]
+        self.clientOrderId = message["clientOrderId"]
+        self.orderId = message["orderId"]
+        self.type = message["type"]
+        self.side = message["side"]
+        self.quantity = message["quantity"]
+        self.price = message["price"]
+        self.tradeId = message.get("tradeId")
+        self.executedPrice = message.get("executedPrice")
+        self.executedQuantity = message.get("executedQuantity")
+        self.fee = message.get("fee")
+        self.feeAsset = message.get("feeAsset")
+        self.totalExecutedQuantity = message.get("totalExecutedQuantity")
+        self.avgPrice = message.get("avgPrice")
+        self.status = message["status"]
+        self.reason = message.get("reason")
+        self.orderTag = message.get("orderTag")
+        self.totalFee = message.get("totalFee")
+        self.visible = message.get("visible")
+        self.timestamp = message["timestamp"]
+        self.reduceOnly = message.get("reduceOnly")
+        self.maker = message.get("maker")
+
+        return self
+
+
+class ExecutionReport(Record):
+    __slots__ = ("topic", "ts", "data")
+
+    topic: str
+    ts: int
+    data: ExecutionReportData
+
+    @staticmethod
+    def decode(message: dict) -> "ExecutionReport":
+        self = object.__new__(ExecutionReport)
+
+        self.topic = message["topic"]
+        self.ts = message["ts"]
+        self.data = ExecutionReportData.decode(message["data"])
+
+        return self
+
+
+class OrderbookUpdateData(Record):
+    __slots__ = ("symbol", "prevTs", "asks", "bids")
+
+    symbol: str
+    prevTs: int
+    asks: typing.List[typing.List[float]]
+    bids: typing.List[typing.List[float]]
+
+    @staticmethod
+    def decode(message: dict) -> "OrderbookUpdateData":
+        self = object.__new__(OrderbookUpdateData)
+
+        self.symbol = message["symbol"]
+        self.prevTs = message["prevTs"]
+        self.asks = message["asks"]
+        self.bids = message["bids"]
+
+        return self
+
+
+class OrderbookUpdate(Record):
+    __slots__ = ("topic", "ts", "data")
+
+    topic: str
+    ts: int
+    data: OrderbookUpdateData
+
+    @staticmethod
+    def decode(message: dict) -> "OrderbookUpdate":
+        self = object.__new__(OrderbookUpdate)
+
+        self.topic = message["topic"]
+        self.ts = message["ts"]
+        self.data = OrderbookUpdateData.decode(message["data"])
+
+        return self
+
+
+class PositionDataPosition(Record):
+    __slots__ = (
+        "holding",
+        "pendingLongQty",
+        "pendingShortQty",
+        "averageOpenPrice",
+        "pnl24H",
+        "fee24H",
+        "settlePrice",
+        "markPrice",
+        "version",
+        "openingTime",
+        "pnl24HPercentage",
+    )
+
+    holding: float
+    pendingLongQty: float | None
+    pendingShortQty: float | None
+    averageOpenPrice: float | None
+    pnl24H: float | None
+    fee24H: float | None
+    settlePrice: float | None
+    markPrice: float | None
+    version: int | None
+    openingTime: int | None
+    pnl24HPercentage: float | None
+
+    @staticmethod
+    def decode(message: dict) -> "PositionDataPosition":
+        self = object.__new__(PositionDataPosition)
+
+        self.holding = message["holding"]
+        self.pendingLongQty = message.get("pendingLongQty")
+        self.pendingShortQty = message.get("pendingShortQty")
+        self.averageOpenPrice = message.get("averageOpenPrice")
+        self.pnl24H = message.get("pnl24H")
+        self.fee24H = message.get("fee24H")
+        self.settlePrice = message.get("settlePrice")
+        self.markPrice = message.get("markPrice")
+        self.version = message.get("version")
+        self.openingTime = message.get("openingTime")
+        self.pnl24HPercentage = message.get("pnl24HPercentage")
+
+        return self
+
+
+class PositionData(Record):
+    __slots__ = ("positions",)
+
+    positions: dict[str, PositionDataPosition]
+
+    @staticmethod
+    def decode(message: dict) -> "PositionData":
+        self = object.__new__(PositionData)
+
+        self.positions = {
+            key: PositionDataPosition.decode(value)
+            for key, value in message["positions"].items()
+        }
+
+        return self
+
+
+class Position(Record):
+    __slots__ = ("topic", "ts", "data")
+
+    topic: typing.Literal["position"]
+    ts: int
+    data: PositionData
+
+    @staticmethod
+    def decode(message: dict) -> "Position":
+        self = object.__new__(Position)
+
+        self.topic = message["topic"]
+        self.ts = message["ts"]
+        self.data = PositionData.decode(message["data"])
+
+        return self
+
+
+class BalanceDataBalance(Record):
+    __slots__ = (
+        "holding",
+        "frozen",
+        "interest",
+        "pendingShortQty",
+        "pendingExposure",
+        "pendingLongQty",
+        "pendingLongExposure",
+        "version",
+        "staked",
+        "unbonding",
+        "vault",
+        "averageOpenPrice",
+        "pnl24H",
+        "fee24H",
+        "markPrice",
+        "pnl24HPercentage",
+    )
+
+    holding: float
+    frozen: float | None
+    interest: float | None
+    pendingShortQty: float | None
+    pendingExposure: float | None
+    pendingLongQty: float | None
+    pendingLongExposure: float | None
+    version: int | None
+    staked: float | None
+    unbonding: float | None
+    vault: float | None
+    averageOpenPrice: float | None
+    pnl24H: float | None
+    fee24H: float | None
+    markPrice: float | None
+    pnl24HPercentage: float | None
+
+    @staticmethod
+    def decode(message: dict) -> "BalanceDataBalance":
+        self = object.__new__(BalanceDataBalance)
+
+        self.holding = message["holding"]
+        self.frozen = message.get("frozen")
+        self.interest = message.get("interest")
+        self.pendingShortQty = message.get("pendingShortQty")
+        self.pendingExposure = message.get("pendingExposure")
+        self.pendingLongQty = message.get("pendingLongQty")
+        self.pendingLongExposure = message.get("pendingLongExposure")
+        self.version = message.get("version")
+        self.staked = message.get("staked")
+        self.unbonding = message.get("unbonding")
+        self.vault = message.get("vault")
+        self.averageOpenPrice = message.get("averageOpenPrice")
+        self.pnl24H = message.get("pnl24H")
+        self.fee24H = message.get("fee24H")
+        self.markPrice = message.get("markPrice")
+        self.pnl24HPercentage = message.get("pnl24HPercentage")
+
+        return self
+
+
+class BalanceData(Record):
+    __slots__ = ("balances",)
+
+    balances: dict[str, BalanceDataBalance]
+
+    @staticmethod
+    def decode(message: dict) -> "BalanceData":
+        self = object.__new__(BalanceData)
+
+        self.balances = {
+            key: BalanceDataBalance.decode(value)
+            for key, value in message["balances"].items()
+        }
+
+        return self
+
+
+class Balance(Record):
+    __slots__ = ("topic", "ts", "data")
+
+    topic: typing.Literal["balance"]
+    ts: int
+    data: BalanceData
+
+    @staticmethod
+    def decode(message: dict) -> "Balance":
+        self = object.__new__(Balance)
+
+        self.topic = message["topic"]
+        self.ts = message["ts"]
+        self.data = BalanceData.decode(message["data"])
+
+        return self
+
+
+for record in (
+    ExecutionReportData,
+    ExecutionReport,
+    OrderbookUpdateData,
+    OrderbookUpdate,
+    PositionDataPosition,
+    PositionData,
+    Position,
+    BalanceDataBalance,
+    BalanceData,
+    Balance,
+):
+    if record.__slots__ != tuple(getattr(ws, record.__name__).__annotations__):
+        raise TypeError(f"{record.__name__} is out of step with ws.{record.__name__}")
@@ -63,6 +63,32 @@ class MarketTradesResponse(typing.TypedDict):
     rows: typing.List[MarketTradesResponseRow]
 
 
+class PaginationMeta(typing.TypedDict):
+    total: int
+    records_per_page: int
+    current_page: int
+
+
+class MarketTradesHistoryResponseRow(typing.TypedDict):
+    symbol: str
+    side: typing.Literal["BUY", "SELL"]
+    source: typing.Literal[0, 1]
+    executed_price: float
+    executed_quantity: float
+    executed_timestamp: int
+
+
+class MarketTradesHistoryResponseData(typing.TypedDict):
+    rows: typing.List[MarketTradesHistoryResponseRow]
+    meta: PaginationMeta
+
+
+class MarketTradesHistoryResponse(typing.TypedDict):
+    success: bool
+    data: MarketTradesHistoryResponseData
+    timestamp: int
+
+
 KlineType = typing.Literal[
     "1m", "5m", "15m", "30m", "1h", "4h", "12h", "1d", "1w", "1mon", "1y"
 ]
@@ -86,6 +112,17 @@ class KlineResponse(typing.TypedDict):
     rows: typing.List[KlineResponseRow]
 
 
+class KlineHistoryResponseData(typing.TypedDict):
+    rows: typing.List[KlineResponseRow]
+    meta: PaginationMeta
+
+
+class KlineHistoryResponse(typing.TypedDict):
+    success: bool
+    data: KlineHistoryResponseData
+    timestamp: int
+
+
 class AvailableTokenResponseRow(typing.TypedDict):
     token: str
     fullname: str
@@ -151,6 +188,83 @@ class CancelOrdersParams(typing.TypedDict):
     symbol: str
 
 
+class GetOrdersParams(typing.TypedDict):
+    symbol: typing_extensions.NotRequired[str]
+    side: typing_extensions.NotRequired[typing.Literal["BUY", "SELL"]]
+    order_type: typing_extensions.NotRequired[typing.Literal["LIMIT", "MARKET"]]
+    status: typing_extensions.NotRequired[
+        typing.Literal[
+            "NEW",
+            "CANCELLED",
+            "PARTIAL_FILLED",
+            "FILLED",
+            "REJECTED",
+            "INCOMPLETE",
+            "COMPLETED",
+        ]
+    ]  # INCOMPLETE = NEW + PARTIAL_FILLED, COMPLETED = CANCELLED + FILLED
+    order_tag: typing_extensions.NotRequired[str]
+    start_t: typing_extensions.NotRequired[int]
+    end_t: typing_extensions.NotRequired[int]
+    page: typing_extensions.NotRequired[int]
+    size: typing_extensions.NotRequired[int]
+
+
+class GetOrdersResponseRow(typing.TypedDict):
+    symbol: str
+    status: str
+    side: typing.Literal["BUY", "SELL"]
+    created_time: str
+    updated_time: str
+    order_id: int
+    order_tag: str
+    price: float | None
+    type: str
+    quantity: float | None
+    amount: float | None
+    visible: float
+    executed: float
+    total_fee: float
+    fee_asset: str
+    client_order_id: int | None
+    reduce_only: bool
+    average_executed_price: float | None
+
+
+class GetOrdersResponse(typing.TypedDict):
+    success: bool
+    meta: PaginationMeta
+    rows: typing.List[GetOrdersResponseRow]
+
+
+class TradeHistoryParams(typing.TypedDict):
+    symbol: typing_extensions.NotRequired[str]
+    order_tag: typing_extensions.NotRequired[str]
+    start_t: typing_extensions.NotRequired[int]
+    end_t: typing_extensions.NotRequired[int]
+    page: typing_extensions.NotRequired[int]
+    size: typing_extensions.NotRequired[int]
+
+
+class TradeHistoryResponseRow(typing.TypedDict):
+    id: int
+    symbol: str
+    fee: float
+    fee_asset: str
+    side: typing.Literal["BUY", "SELL"]
+    order_id: int
+    executed_price: float
+    executed_quantity: float
+    executed_timestamp: str
+    is_maker: int
+
+
+class TradeHistoryResponse(typing.TypedDict):
+    success: bool
+    meta: PaginationMeta
+    rows: typing.List[TradeHistoryResponseRow]
+
+
 class OrderBookSnapshotResponseOrder(typing.TypedDict):
     price: float
     quantity: float